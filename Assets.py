@@ -0,0 +1,201 @@
+from PIL import Image, ImageChops, ImageOps
+import json
+import mmap
+import os
+import threading
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+asset_path = os.path.join(current_dir, 'assets')
+atlas_path = os.path.join(asset_path, 'atlas.bin')
+atlas_index_path = os.path.join(asset_path, 'atlas.json')
+
+# 키잉/크기 조절 방식이 바뀌면 올려서 기존 아틀라스를 무효화
+ATLAS_VERSION = 1
+
+class Assets:
+    def __init__(self):
+        # 프로세스 전체에서 공유하는 스프라이트 저장소
+        # 반환된 이미지는 여러 객체가 함께 쓰므로 절대 수정하지 말 것 (필요하면 copy())
+        self.images = {}
+        self.sequences = {}
+        self.sprites = {}  # RGB565로 변환해 둔 스프라이트 (게임 화면 합성용)
+        self.hits = 0
+        self.misses = 0
+        self.atlas_checked = False
+        self.atlas_loaded = False
+        self.atlas_entries = {}
+        self.atlas_data = None
+        self.lock = threading.Lock()  # 메인 스레드와 예열 스레드가 같은 이미지를 두 번 읽지 않도록
+
+    def get(self, name, size, transparent=False, mirrored=False):
+        # 이미지 조회 (없을 때만 아틀라스나 디스크에서 로드)
+        key = (name, size, transparent, mirrored)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        with self.lock:
+            if not self.atlas_checked:
+                self.load_atlas()
+            image = self.images.get(key)
+            if image is None:
+                self.misses += 1
+                image = self.from_atlas(key) or self.load(name, size, transparent, mirrored)
+                self.images[key] = image
+            return image
+
+    def frames(self, names, size, transparent=False, mirrored=False):
+        # 애니메이션 프레임 묶음 조회 (튜플로 공유)
+        key = (tuple(names), size, transparent, mirrored)
+        sequence = self.sequences.get(key)
+        if sequence is not None:
+            self.hits += 1
+            return sequence
+        sequence = tuple(self.get(name, size, transparent, mirrored) for name in names)
+        self.sequences[key] = sequence
+        return sequence
+
+    def sprite(self, name, size, transparent=False, mirrored=False):
+        # RGB565 스프라이트 조회 (처음 한 번만 변환)
+        key = (name, size, transparent, mirrored)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        from Framebuffer import Sprite
+        sprite = self.sprites[key] = Sprite.from_image(self.get(name, size, transparent, mirrored))
+        return sprite
+
+    def sprite_frames(self, names, size, transparent=False, mirrored=False):
+        # RGB565 애니메이션 프레임 묶음 (튜플로 공유)
+        key = ('sprite', tuple(names), size, transparent, mirrored)
+        sequence = self.sequences.get(key)
+        if sequence is not None:
+            self.hits += 1
+            return sequence
+        self.misses += 1
+        sequence = self.sequences[key] = tuple(self.sprite(name, size, transparent, mirrored) for name in names)
+        return sequence
+
+    def load(self, name, size, transparent, mirrored):
+        # 원본 PNG 로드, 크기 조절, 투명 처리, 좌우 반전
+        if mirrored:
+            original_key = (name, size, transparent, False)
+            original = self.images.get(original_key)
+            if original is None:
+                original = self.load(name, size, transparent, False)
+                self.images[original_key] = original
+            return ImageOps.mirror(original)
+        image = Image.open(os.path.join(asset_path, name)).resize(size)
+        if transparent:
+            image = make_transparent(image.convert('RGBA'))
+        return image
+
+    def load_atlas(self):
+        # 미리 구워둔 아틀라스를 메모리 매핑하고 인덱스만 읽음 (오래된 경우 PNG로 대체)
+        # 각 이미지는 처음 요청될 때 매핑에서 바로 만들어지므로 시작 시에는 필요한 페이지만 읽힘
+        self.atlas_checked = True
+        index = read_atlas_index()
+        if index is None or is_stale(index):
+            return False
+        with open(atlas_path, 'rb') as f:
+            self.atlas_data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        for name, width, height, transparent, mirrored, offset in index['entries']:
+            self.atlas_entries[(name, (width, height), transparent, mirrored)] = offset
+        self.atlas_loaded = True
+        return True
+
+    def from_atlas(self, key):
+        # 아틀라스에 있는 이미지 (없으면 None)
+        offset = self.atlas_entries.get(key)
+        if offset is None:
+            return None
+        width, height = key[1]
+        data = self.atlas_data[offset:offset + width * height * 4]
+        return Image.frombuffer('RGBA', (width, height), data, 'raw', 'RGBA', 0, 1)
+
+    def preload(self, entries=None):
+        # 목록의 이미지를 미리 읽어 둠 (기본: 게임이 쓰는 모든 스프라이트)
+        for name, size, transparent, mirrored in entries or MANIFEST:
+            self.get(name, size, transparent, mirrored)
+        return len(self.images)
+
+    def stats(self):
+        # 캐시 적중/실패 횟수
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.images), 'atlas': self.atlas_loaded}
+
+def make_transparent(image):
+    # 이미지 배경을 투명하게 만듦 (검은색 픽셀의 알파를 0으로)
+    image = image.convert("RGBA")
+    r, g, b, a = image.split()
+    visible = ImageChops.lighter(ImageChops.lighter(r, g), b).point(lambda v: 255 if v else 0)
+    image.putalpha(ImageChops.multiply(a, visible))
+    return image
+
+def source_stamp(name):
+    # 원본 PNG의 크기와 수정 시각
+    stat = os.stat(os.path.join(asset_path, name))
+    return [stat.st_size, stat.st_mtime_ns]
+
+def read_atlas_index():
+    # 아틀라스 인덱스 읽기
+    if not os.path.exists(atlas_index_path) or not os.path.exists(atlas_path):
+        return None
+    try:
+        with open(atlas_index_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_stale(index):
+    # 원본 PNG가 바뀌었거나 굽는 방식이 달라졌으면 오래된 아틀라스
+    if index.get('version') != ATLAS_VERSION:
+        return True
+    for name, stamp in index['sources'].items():
+        try:
+            if source_stamp(name) != stamp:
+                return True
+        except OSError:
+            return True
+    return False
+
+def bake():
+    # 매니페스트의 모든 스프라이트를 키잉/크기 조절/반전해 하나의 아틀라스로 저장
+    baker = Assets()
+    baker.atlas_checked = True
+    entries = []
+    sources = {}
+    offset = 0
+    with open(atlas_path + '.tmp', 'wb') as f:
+        for name, size, transparent, mirrored in MANIFEST:
+            image = baker.get(name, size, transparent, mirrored).convert('RGBA')
+            data = image.tobytes()
+            f.write(data)
+            entries.append([name, size[0], size[1], transparent, mirrored, offset])
+            sources[name] = source_stamp(name)
+            offset += len(data)
+    with open(atlas_index_path + '.tmp', 'w') as f:
+        json.dump({'version': ATLAS_VERSION, 'sources': sources, 'entries': entries}, f)
+    os.replace(atlas_path + '.tmp', atlas_path)
+    os.replace(atlas_index_path + '.tmp', atlas_index_path)
+    return len(entries), offset
+
+# 모든 모듈이 함께 쓰는 전역 저장소
+assets = Assets()
+
+ENEMY_MOVE = [f'enemy/move/e{i:02d}.png' for i in range(12)]
+ENEMY_DIE = [f'enemy/die/d{i:02d}.png' for i in range(1, 9)]
+PLAYER_MOVE = [f'player/move/{i}.png' for i in range(1, 8)]
+PLAYER_DIG = [f'player/dig/d{i}.png' for i in range(1, 3)]
+BLOCKS = ['blocks/noblock.png', 'blocks/normal_block.png', 'blocks/special_block.png']
+HIVES = ['hive1.png', 'hive2.png']
+BACKGROUNDS = ['background.png', 'clear.png', 'over.png', 'score.png']
+
+# 게임이 사용하는 모든 스프라이트 (이름, 크기, 투명 처리, 좌우 반전)
+MANIFEST = (
+    [(name, (16, 16), True, mirrored) for name in ENEMY_MOVE + ENEMY_DIE + PLAYER_MOVE + PLAYER_DIG for mirrored in (False, True)]
+    + [('missile.png', (8, 8), True, False)]
+    + [(name, (16, 16), False, False) for name in BLOCKS + HIVES]
+    + [(name, (240, 240), False, False) for name in BACKGROUNDS]
+)
\ No newline at end of file
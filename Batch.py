@@ -0,0 +1,204 @@
+import itertools
+import multiprocessing
+import os
+import random
+import time
+import numpy as np
+
+# 봇의 이동 방향별 칸 변화
+MOVES = {'U': (0, -1), 'D': (0, 1), 'L': (-1, 0), 'R': (1, 0)}
+# 결과 파일의 열 (이름, 자료형), 한 판이 한 행
+COLUMNS = (('difficulty', 'U6'), ('seed', np.uint32), ('laser_cooldown', np.float32),
+           ('enemy_speed_multiplier', np.float32), ('score', np.int32), ('survival', np.float32),
+           ('ticks', np.int32), ('cleared', np.bool_), ('game_over', np.bool_), ('lives', np.int8),
+           ('blocks_dug', np.int32), ('enemies_spawned', np.int32))
+
+def bot_policy(game, rng, wander=0.1, danger=3.0, standoff=4):
+    # 단순한 자동 플레이: 같은 줄에 적(또는 부술 수 있는 본거지)이 있으면 그쪽을 보고 쏘고,
+    # 쏠 수 없을 때 적이 가까우면 멀어지는 쪽으로 피하고, 아니면 본거지와 같은 줄의
+    # standoff칸 앞 자리로 가며 막은 블록을 팜 (wander 확률로 무작위 방향)
+    player, game_map = game.player, game.map
+    px, py = player.x, player.y
+    store = game.enemy_store
+    slots = store.slots()
+    targets = sorted(((float(x), float(y)) for x, y in zip(store.x[slots], store.y[slots])),
+                     key=lambda target: abs(target[0] - px) + abs(target[1] - py))
+    if game.clock() - player.last_laser_time >= player.laser_cooldown:
+        # 쏘려면 그쪽으로 반 칸 움직이므로 바로 옆에 붙은 적은 쏘지 않고 피함
+        aims = targets + [(game_map.hive_x, game_map.hive_y)] if game_map.hive_state == 2 else targets
+        for x, y in aims:
+            if abs(x - px) + abs(y - py) < 1.5:
+                continue
+            if abs(y - py) < 0.5:
+                return {'R' if x > px else 'L', 'A'}
+            if abs(x - px) < 0.5:
+                return {'D' if y > py else 'U', 'A'}
+    if targets and abs(targets[0][0] - px) + abs(targets[0][1] - py) < danger:
+        ex, ey = targets[0]
+        escapes = [direction for direction, (mx, my) in MOVES.items()
+                   if game.can_move(int(px + mx), int(py + my)) and abs(px + mx - ex) + abs(py + my - ey) > abs(px - ex) + abs(py - ey)]
+        if escapes:
+            return {rng.choice(escapes)}
+
+    dx, dy = max(game_map.hive_x - standoff, 0) - int(px), game_map.hive_y - int(py)
+    if dx == dy == 0:
+        return set()
+    if rng.random() < wander:
+        direction = rng.choice('UDLR')
+    elif abs(dx) >= abs(dy):
+        direction = 'R' if dx > 0 else 'L'
+    else:
+        direction = 'D' if dy > 0 else 'U'
+    mx, my = MOVES[direction]
+    if game_map.is_diggable(int(px + mx), int(py + my)):
+        return {direction, 'B'}
+    return {direction}
+
+def play_game(game, difficulty, seed, settings=None, max_seconds=120.0):
+    # 봇으로 한 판을 끝까지 (또는 게임 시간 max_seconds까지) 시뮬레이션해 결과 행 하나 반환
+    rng = random.Random(seed)
+    game.start(difficulty, seed, settings)
+    step = 1.0 / game.update_hz
+    ticks = 0
+    while ticks < max_seconds * game.update_hz and not game.game_over and not game.game_clear:
+        game.handle_input(step, bot_policy(game, rng))
+        game.update(step)
+        ticks += 1
+    return (difficulty, seed, game.settings['laser_cooldown'], game.settings['enemy_speed_multiplier'],
+            game.score, game.elapsed, ticks, game.game_clear, game.game_over, game.lives,
+            game.blocks_dug, game.enemies_spawned)
+
+# 작업 프로세스마다 한 번 만들어 여러 판에 재사용하는 게임 (스프라이트 로딩은 처음 한 번)
+worker_game = None
+
+def init_worker():
+    # 작업 프로세스 시작: 화면 없이 시뮬레이션할 게임 준비
+    global worker_game
+    from Replay import headless_game
+    worker_game = headless_game()
+
+def run_task(task):
+    # 작업 하나 (난이도, 시드, 설정, 최대 시간) 실행
+    return play_game(worker_game, *task)
+
+def make_tasks(games, difficulties, sweep=None, seed=0, max_seconds=120.0):
+    # 난이도와 설정 조합마다 같은 시드 목록으로 games판씩 (조합끼리 같은 맵으로 비교)
+    seeds = [random.Random(seed + index).getrandbits(32) for index in range(games)]
+    sweep = sweep or {}
+    names = list(sweep)
+    tasks = []
+    for difficulty in difficulties:
+        for values in itertools.product(*(sweep[name] for name in names)):
+            settings = dict(zip(names, values))
+            tasks.extend((difficulty, game_seed, settings, max_seconds) for game_seed in seeds)
+    return tasks
+
+def run_batch(tasks, workers=None):
+    # 작업을 프로세스 풀에서 나눠 실행하고 열별 배열로 모아 (결과, 걸린 시간) 반환
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 8))
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=init_worker) as pool:
+        rows = pool.map(run_task, tasks, chunksize)
+    elapsed = time.perf_counter() - start
+    results = {name: np.array([row[index] for row in rows], dtype=dtype) for index, (name, dtype) in enumerate(COLUMNS)}
+    return results, elapsed
+
+def summarize(results):
+    # 난이도와 설정 조합별 판 수, 클리어율, 점수 분포(10/50/90 백분위), 평균 생존 시간
+    keys = list(zip(results['difficulty'].tolist(), results['laser_cooldown'].tolist(),
+                    results['enemy_speed_multiplier'].tolist()))
+    lines = [f"{'difficulty':<10} {'cooldown':>8} {'speed':>6} {'games':>6} {'clear':>6} {'over':>6} "
+             f"{'score p10/p50/p90':>20} {'survival':>9}"]
+    for key in sorted(set(keys), key=keys.index):
+        rows = np.array([row == key for row in keys])
+        scores = results['score'][rows]
+        p10, p50, p90 = np.percentile(scores, (10, 50, 90)).round().astype(int)
+        lines.append(f'{key[0]:<10} {key[1]:>8.2f} {key[2]:>6.2f} {rows.sum():>6} '
+                     f"{results['cleared'][rows].mean():>6.1%} {results['game_over'][rows].mean():>6.1%} "
+                     f"{f'{p10}/{p50}/{p90}':>20} {results['survival'][rows].mean():>8.1f}s")
+    return '\n'.join(lines)
+
+def scaling(games=24, max_workers=None):
+    # 작업 프로세스 수를 늘려 가며 초당 판 수 측정 (코어 수에 비례해 늘어나는지 확인)
+    max_workers = max_workers or os.cpu_count() or 1
+    tasks = make_tasks(games, ['medium'], max_seconds=30.0)
+    workers = 1
+    while workers <= max_workers:
+        _, elapsed = run_batch(tasks, workers)
+        print(f'{workers} workers: {len(tasks) / elapsed:.1f} games/s')
+        workers *= 2
+
+def measure_allocations(ticks=2000, warmup=400, seed=3):
+    # 봇이 한 판을 하는 동안의 입력을 기록한 뒤 같은 판을 다시 돌려 안정 상태(warmup 틱 이후)의
+    # 남은 새 객체 수와 새로 만든 적/레이저 뷰 수를 측정 (봇 자체의 할당은 빼고 게임 루프만)
+    from Profiler import AllocationCounter
+    from Replay import headless_game, encode_buttons, BUTTON_SETS
+    game = headless_game()
+    settings = {'enemy_speed_multiplier': 0.1}  # 오래 살아남아 적 생성/사망이 계속 반복되도록
+    rng = random.Random(seed)
+    game.start('easy', seed, settings)
+    masks = []
+    while len(masks) < warmup + ticks and not game.game_over:
+        pressed = bot_policy(game, rng)
+        masks.append(encode_buttons(pressed))
+        game.handle_input(0.05, pressed)
+        game.update(0.05)
+
+    game.start('easy', seed, settings)
+    for mask in masks[:warmup]:
+        game.handle_input(0.05, BUTTON_SETS[mask])
+        game.update(0.05)
+        game.draw()
+    game.renderer.flush()
+    stores = (game.enemy_store, game.projectiles)
+    created = [store.created for store in stores]
+    spawned = [store.spawned for store in stores]
+    with AllocationCounter() as counter:
+        for mask in masks[warmup:]:
+            game.handle_input(0.05, BUTTON_SETS[mask])
+            game.update(0.05)
+            game.draw()
+        game.renderer.flush()
+    measured = len(masks) - warmup
+    print(f'{measured} ticks after {warmup} warm-up ticks: {counter.objects} new objects '
+          f'({counter.objects / max(measured, 1):.2f}/tick)')
+    for name, store, before, spawns in zip(('enemies', 'lasers'), stores, created, spawned):
+        print(f'{name}: {store.spawned - spawns} spawned, {store.created - before} new views '
+              f'(pool capacity {store.capacity})')
+
+if __name__ == '__main__':
+    # 사용법: python Batch.py [--games 200] [--difficulty easy,medium,hard] [--workers N] [--max-seconds 120]
+    #                         [--seed 0] [--set laser_cooldown=2.5,3.5 ...] [--out results.npz]
+    #         python Batch.py --scaling (프로세스 수별 처리량)
+    #         python Batch.py --allocations (풀 재사용과 틱당 할당 측정)
+    import argparse
+    parser = argparse.ArgumentParser(description='bot self-play batch runner')
+    parser.add_argument('--games', type=int, default=200, help='games per difficulty and setting combination')
+    parser.add_argument('--difficulty', default='easy,medium,hard')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-seconds', type=float, default=120.0, help='game-time limit per game')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1,V2',
+                        help='override a difficulty setting (several values sweep all combinations)')
+    parser.add_argument('--out', default='results.npz')
+    parser.add_argument('--scaling', action='store_true')
+    parser.add_argument('--allocations', action='store_true')
+    options = parser.parse_args()
+    if options.scaling:
+        scaling(max_workers=options.workers)
+    elif options.allocations:
+        measure_allocations()
+    else:
+        from Game import DIFFICULTIES
+        sweep = {}
+        for item in options.set:
+            name, values = item.split('=', 1)
+            if name not in DIFFICULTIES['medium']:
+                parser.error(f"unknown setting {name} (choose from {', '.join(DIFFICULTIES['medium'])})")
+            sweep[name] = [float(value) for value in values.split(',')]
+        tasks = make_tasks(options.games, options.difficulty.split(','), sweep, options.seed, options.max_seconds)
+        results, elapsed = run_batch(tasks, options.workers)
+        np.savez_compressed(options.out, **results)
+        print(summarize(results))
+        print(f'{len(tasks)} games in {elapsed:.1f}s ({len(tasks) / elapsed:.1f} games/s) -> {options.out}')
@@ -0,0 +1,210 @@
+import numpy as np
+from SpatialHash import grid_pairs
+
+class EntityPool:
+    # 필드 이름: (자료형, 원소 하나의 모양)
+    FIELDS = {}
+
+    def __init__(self, capacity=32, factory=None):
+        # 개체 속성을 필드별 배열로 보관하는 고정 용량 풀 (구조체 배열 대신 배열 구조체)
+        # 배열은 여기서 한 번만 할당하고 가득 차면 새 개체를 받지 않음 (틱 도중에 다시 할당하지 않도록)
+        # factory(store, slot): 슬롯마다 처음 한 번만 만드는 뷰 객체 (비운 슬롯의 뷰는 다음 개체가 다시 씀)
+        self.capacity = capacity
+        for name, (dtype, shape) in self.FIELDS.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self.factory = factory
+        self.views = [None] * capacity
+        self.live = 0  # 사용 중인 슬롯 수
+        self.created = 0  # 지금까지 만든 뷰 수 (용량을 넘지 않음)
+        self.spawned = 0  # 지금까지 배정한 개체 수
+
+    def occupy(self, slot):
+        # 슬롯을 새 개체에 배정: 필드를 0으로 지우고 뷰는 그 슬롯을 처음 쓸 때만 만듦
+        for name in self.FIELDS:
+            getattr(self, name)[slot] = 0
+        if self.views[slot] is None and self.factory is not None:
+            self.views[slot] = self.factory(self, slot)
+            self.created += 1
+        self.live += 1
+        self.spawned += 1
+
+    def stats(self):
+        # 풀 상태 (용량, 사용 중, 만든 뷰 수, 배정 횟수)
+        return {'capacity': self.capacity, 'live': self.live, 'created': self.created, 'spawned': self.spawned}
+
+class EntityStore(EntityPool):
+    FIELDS = {'active': (np.bool_, ())}
+
+    def __init__(self, capacity=32, factory=None):
+        # 빈 슬롯 목록으로 관리하는 저장소 (개체는 사라질 때까지 같은 슬롯에 머묾)
+        super().__init__(capacity, factory)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def allocate(self):
+        # 빈 슬롯 하나를 새 개체에 배정 (빈 슬롯이 없으면 None)
+        if not self.free:
+            return None
+        slot = self.free.pop()
+        self.occupy(slot)
+        self.active[slot] = True
+        return slot
+
+    def release(self, slots):
+        # 슬롯 반납
+        for slot in slots:
+            slot = int(slot)
+            if self.active[slot]:
+                self.active[slot] = False
+                self.free.append(slot)
+                self.live -= 1
+
+    def clear(self):
+        # 모든 슬롯 반납 (빈 슬롯 순서도 처음처럼 되돌려 다시 0번부터 배정)
+        self.release(self.slots())
+        self.free[:] = range(self.capacity - 1, -1, -1)
+
+    def slots(self):
+        # 사용 중인 슬롯 번호 배열
+        return np.flatnonzero(self.active)
+
+class PackedStore(EntityPool):
+    # 사용 중인 개체가 항상 배열 앞쪽 live개에 빈틈없이 모여 있는 저장소
+    # 사라진 개체는 compact로 뒤쪽 개체를 앞으로 당겨 채움 (순회 중에 목록에서 빼지 않음)
+
+    def allocate(self):
+        # 맨 뒤 다음 슬롯을 새 개체에 배정 (가득 차면 None)
+        if self.live == self.capacity:
+            return None
+        slot = self.live
+        self.occupy(slot)
+        return slot
+
+    def compact(self, keep):
+        # keep(앞쪽 live개에 대한 불리언 배열)이 참인 개체만 순서를 유지한 채 앞으로 모음
+        kept = int(keep.sum())
+        if kept < self.live:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[:kept] = array[:self.live][keep]
+            self.live = kept
+
+    def clear(self):
+        # 모두 제거
+        self.live = 0
+
+class EnemyStore(EntityStore):
+    FIELDS = {
+        'active': (np.bool_, ()),
+        'x': (np.float64, ()),
+        'y': (np.float64, ()),
+        'speed': (np.float64, ()),
+        'path': (np.int32, (3, 2)),  # 다음에 향할 칸들
+        'path_len': (np.int8, ()),
+        'path_index': (np.int8, ()),
+        'facing_right': (np.bool_, ()),
+        'anim': (np.int16, ()),
+        'frame': (np.int16, ()),  # 그릴 이미지 번호 (이동 또는 사망 애니메이션)
+        'dying': (np.bool_, ()),
+        'die_time': (np.float64, ()),
+        'serial': (np.int64, ()),
+    }
+
+    def __init__(self, capacity=32, factory=None, move_frames=12, die_frames=8, die_duration=1.0, separation=0.75):
+        # 적 저장소 (이동, 간격 유지, 애니메이션을 배열 연산으로 처리)
+        super().__init__(capacity, factory)
+        self.move_frames = move_frames
+        self.die_frames = die_frames
+        self.die_duration = die_duration
+        self.separation = separation  # 먼저 나온 적과 유지할 최소 간격 (칸)
+
+    def spawn(self, x, y, speed, serial):
+        # 적 추가 (재사용하는 뷰 반환, 저장소가 가득 차면 추가하지 않고 None)
+        slot = self.allocate()
+        if slot is None:
+            return None
+        self.x[slot] = x
+        self.y[slot] = y
+        self.speed[slot] = speed
+        self.facing_right[slot] = True
+        self.serial[slot] = serial
+        return self.views[slot]
+
+    def set_path(self, slot, path):
+        # 경로 교체 (최대 3칸)
+        path = path[:3]
+        for i, cell in enumerate(path):
+            self.path[slot, i] = cell
+        self.path_len[slot] = len(path)
+        self.path_index[slot] = 0
+
+    def needs_path(self):
+        # 경로가 끝나가는 (재계산이 필요한) 살아 있는 적 슬롯
+        slots = self.slots()
+        slots = slots[~self.dying[slots]]
+        return slots[self.path_index[slots] >= self.path_len[slots] - 1]
+
+    def kill(self, slots, now):
+        # 사망 처리 (이미 죽는 중인 적은 그대로)
+        slots = np.asarray(slots, dtype=np.int64)
+        slots = slots[~self.dying[slots]]
+        self.dying[slots] = True
+        self.die_time[slots] = now
+        self.frame[slots] = 0
+
+    def step(self, dt, now):
+        # 모든 적의 이동, 간격 유지, 애니메이션 프레임 선택을 한 번에 처리하고 사망 연출이 끝난 슬롯 반환
+        slots = self.slots()
+        dying = self.dying[slots]
+
+        # 사망 애니메이션
+        dead = slots[dying]
+        elapsed = now - self.die_time[dead]
+        finished = dead[elapsed >= self.die_duration]
+        die_index = (elapsed / self.die_duration * self.die_frames).astype(np.int64)
+        self.frame[dead] = np.clip(die_index, 0, self.die_frames - 1)
+
+        # 경로를 따라 이동
+        movers = slots[~dying]
+        movers = movers[self.path_index[movers] < self.path_len[movers]]
+        if len(movers):
+            index = self.path_index[movers].astype(np.int64)
+            target_x = self.path[movers, index, 0]
+            target_y = self.path[movers, index, 1]
+            x, y = self.x[movers], self.y[movers]
+            dx, dy = target_x - x, target_y - y
+            distance = np.hypot(dx, dy)
+            moving = distance > 0
+            move = np.minimum(self.speed[movers] * dt, distance)
+            scale = np.divide(move, distance, out=np.zeros_like(distance), where=moving)
+            move_x, move_y = dx * scale, dy * scale
+            blocked = self.blocked(movers, x + move_x, y + move_y)
+
+            go = moving & ~blocked
+            moved = movers[go]
+            self.x[moved] += move_x[go]
+            self.y[moved] += move_y[go]
+            self.facing_right[moved[move_x[go] > 0]] = True
+            self.facing_right[moved[move_x[go] < 0]] = False
+            self.anim[moved] = (self.anim[moved] + 1) % self.move_frames
+            self.frame[moved] = self.anim[moved]
+
+            # 목표 칸에 도착하면 다음 칸으로
+            arrived = ~blocked & (np.abs(self.x[movers] - target_x) < 0.1) & (np.abs(self.y[movers] - target_y) < 0.1)
+            self.path_index[movers[arrived]] += 1
+        return finished
+
+    def blocked(self, movers, new_x, new_y):
+        # 이동하면 먼저 나온 (살아 있는) 적에게 간격 이하로 가까워지는 적
+        blocked = np.zeros(len(movers), dtype=np.bool_)
+        others = self.slots()
+        others = others[~self.dying[others]]
+        a, b = grid_pairs(self.x[movers], self.y[movers], self.x[others], self.y[others])
+        if not len(a):
+            return blocked
+        me, other = movers[a], others[b]
+        older = self.serial[other] < self.serial[me]
+        a, me, other = a[older], me[older], other[older]
+        new_gap = np.maximum(np.abs(new_x[a] - self.x[other]), np.abs(new_y[a] - self.y[other]))
+        gap = np.maximum(np.abs(self.x[me] - self.x[other]), np.abs(self.y[me] - self.y[other]))
+        blocked[a[(new_gap < self.separation) & (new_gap < gap)]] = True
+        return blocked
@@ -0,0 +1,96 @@
+from collections import deque
+from Map import DIRECTIONS
+
+class FlowField:
+    def __init__(self, game_map, radius=32):
+        # 플레이어 칸까지의 거리를 모든 적이 함께 쓰는 거리 지도
+        # 큰 월드에서도 비용이 일정하도록 플레이어 주변 (2*radius+1)칸 정사각형 안에서만 계산
+        self.map = game_map
+        self.radius = radius
+        self.goal = None
+        self.map_version = None
+        self.distances = []
+        self.origin_x = 0
+        self.origin_y = 0
+        self.size = 0
+        self.rebuilds = 0
+
+    def update(self, player_x, player_y):
+        # 플레이어가 다른 칸으로 옮겼거나 맵이 바뀐 경우에만 다시 계산
+        goal = (int(player_x), int(player_y))
+        if goal == self.goal and self.map.version == self.map_version:
+            return False
+        self.goal = goal
+        self.map_version = self.map.version
+        self.rebuild()
+        return True
+
+    def rebuild(self):
+        # 플레이어 칸에서 시작하는 너비 우선 탐색으로 각 칸의 거리 계산 (-1: 도달 불가)
+        gx, gy = self.goal
+        self.origin_x, self.origin_y = gx - self.radius, gy - self.radius
+        size = self.size = 2 * self.radius + 1
+        distances = [-1] * (size * size)
+        game_map = self.map
+        if game_map.get(gx, gy) is not None:
+            distances[self.radius * size + self.radius] = 0
+            queue = deque([(gx, gy)])
+            while queue:
+                x, y = queue.popleft()
+                next_distance = distances[(y - self.origin_y) * size + (x - self.origin_x)] + 1
+                for dx, dy in game_map.walkable_neighbors(x, y):
+                    nx, ny = x + dx, y + dy
+                    local_x, local_y = nx - self.origin_x, ny - self.origin_y
+                    if 0 <= local_x < size and 0 <= local_y < size and distances[local_y * size + local_x] < 0:
+                        distances[local_y * size + local_x] = next_distance
+                        queue.append((nx, ny))
+        self.distances = distances
+        self.rebuilds += 1
+
+    def distance(self, x, y):
+        # 해당 칸에서 플레이어까지의 거리 (-1: 도달 불가 또는 계산 범위 밖)
+        local_x, local_y = x - self.origin_x, y - self.origin_y
+        if 0 <= local_x < self.size and 0 <= local_y < self.size:
+            return self.distances[local_y * self.size + local_x]
+        return -1
+
+    def next_cell(self, x, y):
+        # 거리가 줄어드는 이웃 칸 (없으면 None)
+        current = self.distance(x, y)
+        best = None
+        best_distance = -1
+        for dx, dy in DIRECTIONS:
+            distance = self.distance(x + dx, y + dy)
+            if distance < 0:
+                continue
+            if current >= 0 and distance == current - 1:
+                return (x + dx, y + dy)
+            if current < 0 and (best is None or distance < best_distance):
+                # 도달 불가 칸(예: 본거지 위)에서는 가장 가까운 이웃으로 진입
+                best = (x + dx, y + dy)
+                best_distance = distance
+        if best is None and current < 0 and self.goal is not None:
+            # 계산 범위 밖: 플레이어 쪽으로 가까워지는 빈 칸으로 이동
+            best = self.greedy_cell(x, y)
+        return best
+
+    def greedy_cell(self, x, y):
+        # 플레이어와의 맨해튼 거리를 줄이는 빈 이웃 칸
+        gx, gy = self.goal
+        current = abs(gx - x) + abs(gy - y)
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if abs(gx - nx) + abs(gy - ny) < current and self.map.is_walkable(nx, ny):
+                return (nx, ny)
+        return None
+
+    def path_from(self, x, y, length=2):
+        # 현재 위치에서 거리 지도를 따라 내려가는 다음 몇 칸
+        cell = (int(x), int(y))
+        path = []
+        for _ in range(length):
+            cell = self.next_cell(*cell)
+            if cell is None:
+                break
+            path.append(cell)
+        return path
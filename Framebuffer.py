@@ -0,0 +1,146 @@
+# numpy를 쓰는 화면 버퍼 모듈: 메뉴만 쓸 때는 numpy를 가져오지 않도록 다른 모듈은 처음 쓸 때 가져옴
+import numpy as np
+
+# ST7789가 받는 픽셀 형식: 빅엔디언 16비트 RGB565
+RGB565 = np.dtype('>u2')
+
+def rgb565(color):
+    # (r, g, b[, a]) 색 하나를 RGB565 값으로
+    r, g, b = color[:3]
+    return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
+
+def to_rgb565(image):
+    # PIL 이미지를 RGB565 배열과 1비트 마스크로 변환 (불투명하면 마스크는 None)
+    # 반투명 가장자리는 알파 128을 기준으로 그리거나 버림
+    data = np.asarray(image.convert('RGBA'))
+    r, g, b = (data[:, :, i].astype(np.uint16) for i in range(3))
+    pixels = (((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)).astype(RGB565)
+    mask = data[:, :, 3] >= 128
+    return pixels, None if mask.all() else mask
+
+class Sprite:
+    def __init__(self, pixels, mask=None):
+        # 미리 RGB565로 바꿔 둔 스프라이트 (mask: 그릴 픽셀, None이면 전체)
+        self.pixels = pixels
+        self.mask = mask
+        self.height, self.width = pixels.shape
+
+    @classmethod
+    def from_image(cls, image):
+        # PIL 이미지에서 만들기 (불러올 때 한 번만)
+        return cls(*to_rgb565(image))
+
+class Framebuffer:
+    def __init__(self, width=240, height=240):
+        # 매 프레임 다시 쓰는 RGB565 화면 버퍼 (할당은 처음 한 번)
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width), dtype=RGB565)
+
+    def clip(self, x, y, width, height):
+        # 화면 안에 들어오는 (버퍼 영역, 원본 영역) 슬라이스 (완전히 밖이면 None)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (slice(y0, y1), slice(x0, x1)), (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+    def blit(self, sprite, x, y):
+        # 스프라이트 그리기 (마스크가 있으면 보이는 픽셀만 복사)
+        clipped = self.clip(int(x), int(y), sprite.width, sprite.height)
+        if clipped is None:
+            return
+        target, source = clipped
+        if sprite.mask is None:
+            self.pixels[target] = sprite.pixels[source]
+        else:
+            np.copyto(self.pixels[target], sprite.pixels[source], where=sprite.mask[source])
+
+    def paste(self, pixels, x, y):
+        # RGB565 배열을 그대로 복사 (배경 레이어 등)
+        height, width = pixels.shape
+        clipped = self.clip(x, y, width, height)
+        if clipped is not None:
+            target, source = clipped
+            self.pixels[target] = pixels[source]
+
+    def fill(self, box, color):
+        # 영역을 한 색으로 채움
+        x0, y0, x1, y1 = box
+        self.pixels[max(y0, 0):y1, max(x0, 0):x1] = rgb565(color)
+
+    def region_bytes(self, box, rotation=0):
+        # 영역을 패널 방향으로 돌린 전송용 바이트 (드라이버의 RGB565 변환 없이 바로 보냄)
+        x0, y0, x1, y1 = box
+        region = self.pixels[y0:y1, x0:x1]
+        if rotation:
+            region = np.rot90(region, rotation // 90)
+        return region.tobytes()
+
+    def to_image(self, box=None):
+        # PIL RGB 이미지로 변환 (RGB565를 지원하지 않는 디스플레이나 확인용)
+        from PIL import Image
+        x0, y0, x1, y1 = box or (0, 0, self.width, self.height)
+        return Image.fromarray(rgb888(self.pixels[y0:y1, x0:x1]), 'RGB')
+
+def rgb888(pixels):
+    # RGB565 배열을 RGB 8비트 배열로 (하위 비트는 상위 비트로 채움)
+    pixels = pixels.astype(np.uint16)
+    r = (pixels >> 11) & 0x1F
+    g = (pixels >> 5) & 0x3F
+    b = pixels & 0x1F
+    return np.dstack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2))).astype(np.uint8)
+
+def benchmark(frames=300):
+    # 적 15마리, 레이저, HUD가 있는 프레임을 PIL 경로와 RGB565 버퍼 경로로 합성해 초당 프레임 수 비교
+    import time
+    from PIL import Image
+    from Assets import assets, ENEMY_MOVE, BLOCKS
+    enemy = assets.get(ENEMY_MOVE[0], (16, 16), transparent=True)
+    missile = assets.get('missile.png', (8, 8), transparent=True)
+    layer = Image.new('RGBA', (240, 224))
+    for index in range(15 * 14):
+        layer.paste(assets.get(BLOCKS[index % 3], (16, 16)), (index % 15 * 16, index // 15 * 16))
+    hud = Image.new('RGBA', (240, 16), (0, 0, 0, 255))
+    positions = [(16 * (i % 15), 16 + 13 * i) for i in range(16)]
+
+    def pil_frame():
+        # 기존 경로: 새 RGBA 이미지 합성 -> RGB 변환 -> 드라이버의 회전과 RGB565 변환
+        image = Image.new('RGBA', (240, 240), (0, 0, 0, 255))
+        image.paste(layer, (0, 16))
+        for x, y in positions:
+            image.paste(enemy, (x, y), enemy)
+        for x, y in positions[:4]:
+            image.paste(missile, (x + 4, y + 4), missile)
+        image.paste(hud, (0, 0))
+        data = np.asarray(image.convert('RGB').rotate(180)).astype(np.uint16)
+        color = ((data[:, :, 0] & 0xF8) << 8) | ((data[:, :, 1] & 0xFC) << 3) | (data[:, :, 2] >> 3)
+        return np.dstack(((color >> 8) & 0xFF, color & 0xFF)).astype(np.uint8).tobytes()
+
+    frame = Framebuffer()
+    layer_pixels = to_rgb565(layer)[0]
+    hud_pixels = to_rgb565(hud)[0]
+    enemy_sprite = Sprite.from_image(enemy)
+    missile_sprite = Sprite.from_image(missile)
+
+    def buffer_frame():
+        # 새 경로: 미리 변환한 배열을 재사용 버퍼에 복사 -> 바로 전송 바이트
+        frame.paste(layer_pixels, 0, 16)
+        for x, y in positions:
+            frame.blit(enemy_sprite, x, y)
+        for x, y in positions[:4]:
+            frame.blit(missile_sprite, x + 4, y + 4)
+        frame.paste(hud_pixels, 0, 0)
+        return frame.region_bytes((0, 0, 240, 240), 180)
+
+    assert len(pil_frame()) == len(buffer_frame())
+    for name, compose in (('PIL RGBA -> RGB -> RGB565', pil_frame), ('RGB565 framebuffer', buffer_frame)):
+        start = time.perf_counter()
+        for _ in range(frames):
+            compose()
+        elapsed = time.perf_counter() - start
+        print(f'{name}: {elapsed / frames * 1000:.2f} ms/frame ({frames / elapsed:.0f} fps)')
+
+if __name__ == '__main__':
+    # 사용법: python Framebuffer.py (합성 경로 처리량 비교)
+    benchmark()
@@ -1,65 +1,150 @@
 import time
 import random
-from PIL import Image, ImageDraw, ImageFont
-from Player import Player
+import numpy as np
+from Player import Player, Laser
 from Enemy import Enemy
 from Map import Map
-import os
+from Assets import assets
+from Glyphs import glyph_font, FONT_BOLD
+from Renderer import Renderer
+from Framebuffer import Framebuffer
+from Profiler import profiler, gc_monitor
+from FlowField import FlowField
+from Planner import ReplanScheduler
+from Projectiles import Projectiles
+from Entities import EnemyStore
+from Replay import GameClock
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-asset_path = os.path.join(current_dir, 'assets')
+# 난이도별 설정 (레이저 쿨다운(초), 적 속도 배율), 밸런스 조정은 Batch.py로 시험
+DIFFICULTIES = {
+    'easy': {'laser_cooldown': 2.5, 'enemy_speed_multiplier': 0.3},
+    'medium': {'laser_cooldown': 3.5, 'enemy_speed_multiplier': 0.9},
+    'hard': {'laser_cooldown': 4.5, 'enemy_speed_multiplier': 1.2},
+}
 
 class Game:
-    def __init__(self, joystick):
+    def __init__(self, joystick, update_hz=20, render_hz=20, max_frame_skip=5, world_size=(15, 14),
+                 clock=None, rng=None, replan_budget_us=2000):
         self.joystick = joystick
-        self.map = Map(joystick)
+        # 게임 안의 시각(틱마다 dt만큼 흐름)과 맵 시드용 난수 (재현 실행 시 주입)
+        self.clock = clock if clock is not None else GameClock()
+        self.rng = rng if rng is not None else random.Random()
+        self.seed = None
+        self.recorder = None  # 틱마다 누른 버튼 기록 (main의 --record)
+        # 루프 설정: 초당 시뮬레이션/렌더링 횟수, 연속으로 건너뛸 수 있는 최대 렌더링 수
+        self.update_hz = update_hz
+        self.render_hz = render_hz
+        self.max_frame_skip = max_frame_skip
+        self.missed_deadlines = 0
+        self.frames_skipped = 0
+        self.frames_rendered = 0
+        self.map = Map(joystick, *world_size)
+        self.projectiles = Projectiles(capacity=8, factory=Laser)
         self.player = Player(joystick, self)
-        self.enemies = []
+        self.flow_field = FlowField(self.map)
+        self.planner = ReplanScheduler(replan_budget_us)
+        self.max_enemies = 15
+        self.enemy_store = EnemyStore(capacity=self.max_enemies, factory=lambda store, slot: Enemy(self, store, slot))
         self.enemies_spawned = 0
         self.enemy_spawn_timer = 0
-        self.hive_destroyed = False
         self.score = 0
+        self.blocks_dug = 0
+        self.elapsed = 0.0  # 게임 안에서 흐른 시간 (초, 틱 길이의 합)
         self.lives = 3
         self.difficulty = None
+        self.settings = None
         self.game_over = False
         self.game_clear = False
-        self.clear_background = Image.open(os.path.join(asset_path, 'clear.png')).resize((240, 240))
-        self.over_background = Image.open(os.path.join(asset_path, 'over.png')).resize((240, 240))
-        self.font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
+        self.clear_background = assets.get('clear.png', (240, 240))
+        self.over_background = assets.get('over.png', (240, 240))
+        self.font = glyph_font(FONT_BOLD, 24)
+        self.hud_font = glyph_font()
+        self.hud = None  # HUD 줄 (바뀐 글자만 다시 그림)
+        self.trace = False  # 실행 내내 측정 (main의 --trace)
+        self.show_profile = False
+        self.profile = None
+        self.profile_text = None
+        self.profile_time = 0.0
+        self.profile_box = (0, 228, 240, 240)
+        self.renderer = Renderer(joystick.disp, threaded=True)  # SPI 전송은 표시 스레드에서
+        self.input = joystick.input
+        gc_monitor.install()
 
-    def start(self, difficulty):
-        # 게임 시작 시 초기화
+    def start(self, difficulty, seed=None, settings=None):
+        # 게임 시작 시 초기화 (seed: 맵 시드, None이면 난수에서 뽑음, settings: 난이도 설정 중 바꿀 값)
         self.difficulty = difficulty
-        self.map.generate_map()
+        self.seed = self.rng.getrandbits(32) if seed is None else seed
+        self.clock.reset()
+        self.map.generate_map(self.seed)
         self.map.hive_state = 1
         self.map.enemies_spawned = 0 
-        self.player.reset()
-        self.enemies = []
-        self.enemy_spawn_timer = 0
+        self.player.start()
+        self.enemies_spawned = 0
+        self.enemy_store.clear()
+        self.planner.clear()
+        self.enemy_spawn_timer = float('-inf')
         self.score = 0
+        self.blocks_dug = 0
+        self.elapsed = 0.0
         self.lives = 3
         self.game_over = False
         self.game_clear = False
+        self.hud_text = None
+        self.renderer.invalidate()
+        self.input.clear()
+        self.missed_deadlines = 0
+        self.frames_skipped = 0
+        self.frames_rendered = 0
 
         # 난이도에 따른 게임 설정
-        if difficulty == 'easy':
-            self.player.laser_cooldown = 2.5
-            self.enemy_speed_multiplier = 0.3
-        elif difficulty == 'medium':
-            self.player.laser_cooldown = 3.5
-            self.enemy_speed_multiplier = 0.9
-        else:  # hard
-            self.player.laser_cooldown = 4.5
-            self.enemy_speed_multiplier = 1.2
+        self.settings = dict(DIFFICULTIES.get(difficulty, DIFFICULTIES['hard']), **(settings or {}))
+        self.player.laser_cooldown = self.settings['laser_cooldown']
+        self.enemy_speed_multiplier = self.settings['enemy_speed_multiplier']
+        if self.recorder is not None:
+            self.recorder.begin(self)
 
     def run(self):
-        # 게임 메인 루프
+        # 게임 메인 루프 (고정 간격으로 시뮬레이션, 늦어지면 렌더링을 건너뛰고 남은 시간만 대기)
+        step = 1.0 / self.update_hz
+        render_interval = 1.0 / self.render_hz
+        next_update = next_render = time.perf_counter()
+        skipped_in_row = 0
         while not self.game_over and not self.game_clear:
-            self.handle_input()
-            self.update()
-            self.draw()
-            time.sleep(0.05)
+            now = time.perf_counter()
+            updates = 0
+            while now >= next_update and updates < self.max_frame_skip:
+                if now - next_update > step:
+                    self.missed_deadlines += 1
+                with profiler.section('handle_input'):
+                    self.handle_input(step)
+                with profiler.section('update'):
+                    self.update(step)
+                next_update += step
+                updates += 1
+                if self.game_over or self.game_clear:
+                    break
+            if now >= next_update:
+                # 너무 밀렸으면 남은 틱을 버리고 현재 시각에서 다시 시작
+                next_update = now
+
+            now = time.perf_counter()
+            if now >= next_render:
+                if now < next_update or skipped_in_row >= self.max_frame_skip:
+                    with profiler.section('draw'):
+                        self.draw()
+                    self.frames_rendered += 1
+                    skipped_in_row = 0
+                else:
+                    self.frames_skipped += 1
+                    skipped_in_row += 1
+                next_render = max(next_render + render_interval, now)
+
+            delay = min(next_update, next_render) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
 
+        if self.recorder is not None:
+            self.recorder.finish(self)
         if self.game_over:
             self.draw_game_over()
             return 'game_over'
@@ -70,102 +155,122 @@ class Game:
     def can_dig(self, x, y):
         # 해당 위치가 파괴 가능한 블록인지 확인
         x, y = int(x), int(y)
-        if x < 0 or y < 0 or y >= len(self.map.grid) or x >= len(self.map.grid[0]):
-            return False
-        return self.map.grid[y][x] in [1, 2]  # 1: 일반 블럭, 2: 특수 블럭
+        return self.map.is_diggable(x, y)  # 1: 일반 블럭, 2: 특수 블럭
 
     def destroy_block(self, x, y):
         # 블록 파괴 및 점수 추가
         x, y = int(x), int(y)
         if self.can_dig(x, y):
-            block_type = self.map.grid[y][x]
-            self.map.grid[y][x] = 0
+            block_type = self.map.get(x, y)
+            self.map.set_block(x, y, 0)
+            self.blocks_dug += 1
             if block_type == 1:
                 self.score += 100
             elif block_type == 2:
                 self.score += 300
 
-    def handle_input(self):
-        # 사용자 입력 처리
-        if not self.joystick.button_U.value:
-            self.player.move('up')
-        elif not self.joystick.button_D.value:
-            self.player.move('down')
-        elif not self.joystick.button_L.value:
-            self.player.move('left')
-        elif not self.joystick.button_R.value:
-            self.player.move('right')
-
-        if not self.joystick.button_A.value:
+    def loop_stats(self):
+        # 루프 상태 (마감 시간을 놓친 틱 수, 건너뛴/그린 프레임 수, 스프라이트 캐시 적중/실패 등)
+        return {'missed_deadlines': self.missed_deadlines, 'frames_skipped': self.frames_skipped,
+                'frames_rendered': self.frames_rendered, 'planner': self.planner.stats(),
+                'display': self.renderer.stats(), 'gc': gc_monitor.stats(), 'assets': assets.stats(),
+                'pools': {'enemies': self.enemy_store.stats(), 'lasers': self.projectiles.stats()}}
+
+    def read_buttons(self):
+        # 이번 틱에 눌린 버튼 (지금 눌린 버튼 + 지난 틱 이후 눌렸다 떼어진 짧은 탭)
+        pressed = set(self.input.pressed)
+        for event in self.input.events():
+            if event.kind == 'press':
+                pressed.add(event.button)
+                if event.button == 'C':
+                    self.toggle_profile()
+        return pressed
+
+    def handle_input(self, dt, pressed=None):
+        # 사용자 입력 처리 (pressed: 재현 실행 시 기록에서 읽은 버튼, None이면 입력 장치에서 읽음)
+        if pressed is None:
+            pressed = self.read_buttons()
+        if self.recorder is not None:
+            self.recorder.record(pressed)
+        if 'U' in pressed:
+            self.player.move('up', dt)
+        elif 'D' in pressed:
+            self.player.move('down', dt)
+        elif 'L' in pressed:
+            self.player.move('left', dt)
+        elif 'R' in pressed:
+            self.player.move('right', dt)
+
+        if 'A' in pressed:
             self.player.shoot_laser()
-        if not self.joystick.button_B.value:
+        if 'B' in pressed:
             self.player.dig()
 
-    def update(self):
-        # 게임 상태 업데이트
-        self.player.update()
-        self.check_collisions()
+    def update(self, dt):
+        # 게임 상태 업데이트 (dt: 한 틱의 길이(초))
+        self.elapsed += dt
+        self.clock.advance(dt)
+        with profiler.section('player'):
+            self.player.update(dt)
+        with profiler.section('collisions'):
+            self.check_collisions()
         self.spawn_enemy()
-        
-        if self.map.hive_state == 0:
-            self.hive_destroyed = True
+
+        # 대기 중인 경로 재계산을 프레임 예산 안에서 처리 (거리 지도는 플레이어 칸이나 맵이 바뀐 경우에만 다시 계산)
+        with profiler.section('planner'):
+            self.planner.run(self.flow_field, self.player.x, self.player.y)
 
         # 적 업데이트 및 죽은 적 제거
-        self.enemies = [enemy for enemy in self.enemies if not enemy.update(self.player.x, self.player.y, avoid_positions=[(e.x, e.y) for e in self.enemies if e != enemy])]
-
-        # 레이저 업데이트 및 충돌 검사
-        for laser in self.player.lasers[:]:
-            laser.update()
-            x, y = int(laser.x * 16), int(laser.y * 16)
-            if x < -8 or x >= self.map.width * 16 - 8 or y < -8 or y >= self.map.height * 16 - 8 or self.map.grid[y // 16][x // 16] in [1, 2]:
-                self.player.lasers.remove(laser)
-            elif self.map.grid[y // 16][x // 16] in [1, 2]:
-                self.destroy_block(x // 16, y // 16)
-                self.player.lasers.remove(laser)
+        with profiler.section('enemies'):
+            self.update_enemies(dt)
+
+        # 레이저 이동과 적/본거지/블록/맵 경계 충돌 (틱마다 한 번, 지나간 경로 전체로 판정)
+        with profiler.section('projectiles'):
+            self.update_projectiles(dt)
+
+        # 카메라가 플레이어를 따라감
+        self.map.update_camera(self.player.x, self.player.y)
         
         # 게임 클리어 체크
-        if self.map.hive_state == 0 and len(self.enemies) == 0:
+        if self.map.hive_state == 0 and self.enemy_store.live == 0:
             self.game_clear = True
             self.score += 5000
                 
-    def update_enemies(self):
-        # 적 업데이트
-        for enemy in self.enemies:
-            enemy.update(self.player.x, self.player.y, avoid_positions=[(e.x, e.y) for e in self.enemies if e != enemy])
+    def update_enemies(self, dt):
+        # 적 이동/간격 유지/애니메이션을 배열 연산으로 한 번에 처리하고 사망 연출이 끝난 적 제거
+        store = self.enemy_store
+        for slot in store.needs_path():
+            self.planner.request(store.views[slot])
+        store.release(store.step(dt, self.clock()))
 
-    def check_collisions(self):
-        # 충돌 검사
-        for enemy in self.enemies[:]:
-            if abs(self.player.x - enemy.x) < 1 and abs(self.player.y - enemy.y) < 1:
-                self.player_hit()
-
-        # 레이저-적 충돌
-        for laser in self.player.lasers[:]: 
-            for enemy in self.enemies[:]:
-                if laser.collides_with(enemy):
-                    enemy.die()
-                    self.player.lasers.remove(laser)
-                    self.score += 300
-                    break
+    def update_projectiles(self, dt):
+        # 레이저를 이동시키고 맞힌 적은 사망 처리, 본거지를 맞혔으면 파괴 (죽는 중인 적은 맞지 않음)
+        store = self.enemy_store
+        slots = store.slots()
+        kills, hive_hit = self.projectiles.step(dt, self.map, store, slots[~store.dying[slots]])
+        if kills:
+            store.kill(kills, self.clock())
+            self.score += 300 * len(kills)
+        if hive_hit:
+            self.map.destroy_hive()
+            self.score += 1000
 
-        # 레이저-적의 본거지 충돌
-        if self.map.hive_state == 2:
-            for laser in self.player.lasers[:]:
-                if laser.collides_with_hive(self.map.hive_x, self.map.hive_y):
-                    self.map.destroy_hive()
-                    self.player.lasers.remove(laser)
-                    self.score += 1000
-                    break
+    def check_collisions(self):
+        # 플레이어-적 충돌 검사 (배열 연산으로 한 번에 비교, 레이저 충돌은 update_projectiles에서)
+        store = self.enemy_store
+        slots = store.slots()
+        if np.any((np.abs(store.x[slots] - self.player.x) < 1) & (np.abs(store.y[slots] - self.player.y) < 1)):
+            self.player_hit()
 
     def spawn_enemy(self):
         # 적 생성
-        current_time = time.time()
-        if (current_time - self.enemy_spawn_timer >= 3 and len(self.enemies) < 15 and self.map.hive_state > 0):
-            spawn_x, spawn_y = self.map.hive_x, self.map.hive_y
-            new_enemy = Enemy(self.joystick, spawn_x, spawn_y, self.enemy_speed_multiplier, self)
-            self.enemies.append(new_enemy)
+        current_time = self.clock()
+        if (current_time - self.enemy_spawn_timer >= 3 and self.enemy_store.live < self.max_enemies and self.map.hive_state > 0):
+            # 적 뷰는 저장소가 슬롯마다 재사용 (판이 진행돼도 새 객체를 만들지 않음)
             self.enemy_spawn_timer = current_time
             self.enemies_spawned += 1
+            self.enemy_store.spawn(self.map.hive_x, self.map.hive_y, Enemy.SPEED * self.enemy_speed_multiplier,
+                                   self.enemies_spawned)
             self.map.enemies_spawned += 1
             if (self.enemies_spawned >= 10):
                 self.map.upgrade_hive()
@@ -177,53 +282,106 @@ class Game:
             self.game_over = True
         else:
             # 모든 적 제거
-            self.enemies.clear()
+            self.enemy_store.clear()
+            self.planner.clear()
             # 플레이어 초기화
             self.player.reset()
             
     def can_move(self, x, y):
         # 해당 위치로 이동 가능한지 확인
         x, y = int(x), int(y)
-        if x < 0 or y < 0 or y >= len(self.map.grid) or x >= len(self.map.grid[0]):
-            return False
-        return self.map.grid[y][x] == 0
+        return self.map.is_walkable(x, y)
 
     def draw(self):
-        # 게임 화면 그리기
-        image = Image.new('RGBA', (self.joystick.width, self.joystick.height), (0, 0, 0, 255))
-        self.map.draw(image)
-        self.player.draw(image)
-        for enemy in self.enemies:
-            enemy.draw(image)
+        # 게임 화면 그리기 (완성된 프레임은 표시 스레드에 넘기고 전송을 기다리지 않음)
+        # 화면 버퍼는 재사용하고 매 프레임 배경 레이어부터 전부 덮어씀 (RGB565 그대로 전송)
+        start = time.perf_counter()
+        image = self.renderer.acquire()
+        camera = (self.map.camera_x, self.map.camera_y)
+        with profiler.section('map'):
+            for box in self.map.draw(image):
+                self.renderer.mark(box)
+        with profiler.section('sprites'):
+            self.player.draw(image, camera)
+            self.renderer.mark_sprite(self.player.box(camera))
+            lasers = self.projectiles
+            for index in range(lasers.live):
+                self.renderer.mark_sprite(lasers.views[index].box(camera))
+            for enemy in self.visible_enemies():
+                enemy.draw(image, camera)
+                self.renderer.mark_sprite(enemy.box(camera))
         self.draw_hud(image)
-        self.joystick.disp.image(image.convert('RGB')) 
+        if self.show_profile:
+            self.draw_profile(image)
+        self.renderer.record('compose', time.perf_counter() - start)
+        with profiler.section('present'):
+            self.renderer.present(image)
+
+    def visible_enemies(self):
+        # 카메라 영역에 걸친 적만 생성 순서대로
+        store = self.enemy_store
+        slots = store.slots()
+        x, y = store.x[slots] - self.map.camera_x, store.y[slots] - self.map.camera_y
+        slots = slots[(x > -1) & (x < self.map.view_width) & (y > -1) & (y < self.map.view_height)]
+        return [store.views[slot] for slot in slots[np.argsort(store.serial[slots], kind='stable')]]
 
     def draw_hud(self, image):
-        # HUD(점수, 생명) 그리기
-        draw = ImageDraw.Draw(image)
+        # HUD(점수, 생명) 그리기 (바뀐 글자 칸만 다시 그리고 그 영역만 전송 대상으로 표시)
         score_text = f'{self.score:05d}'
         life_text = f'Lives: {self.lives}'
-        draw.text((0, 0), score_text, fill=(255, 255, 255))
-        draw.text((180, 0), life_text, fill=(255, 255, 255))
+        if self.hud_text is None:
+            self.hud = Framebuffer(self.joystick.width, 16)
+            self.renderer.mark((0, 0, self.joystick.width, 16))
+            old_score, old_life = None, None
+        else:
+            old_score, old_life = self.hud_text
+        for position, old, new in (((0, 0), old_score, score_text), ((180, 0), old_life, life_text)):
+            for box in self.hud_font.update(self.hud, position, old, new, (255, 255, 255), (0, 0, 0, 255), 16):
+                self.renderer.mark(box)
+        self.hud_text = (score_text, life_text)
+        image.paste(self.hud.pixels, 0, 0)
+
+    def toggle_profile(self):
+        # C 버튼: 단계별 시간 오버레이 켜기/끄기 (켜져 있는 동안만 측정, --trace로 시작했으면 계속 측정)
+        self.show_profile = not self.show_profile
+        profiler.enabled = self.show_profile or self.trace
+        self.profile_text = None
+        self.renderer.mark(self.profile_box)
+
+    def draw_profile(self, image):
+        # 화면 아래에 최근 1초의 FPS와 단계별 평균 시간(ms) 표시 (0.5초마다 갱신)
+        now = time.perf_counter()
+        if self.profile_text is None or now - self.profile_time >= 0.5:
+            summary = profiler.summary()
+            frames, draw_ms = summary.get('draw', (0, 0.0))
+            text = (f"{frames}fps u{summary.get('update', (0, 0.0))[1]:.1f} d{draw_ms:.1f} "
+                    f"spi{summary.get('transfer', (0, 0.0))[1]:.1f}ms")
+            if self.profile_text is None:
+                self.profile = Framebuffer(self.joystick.width, 12)
+            for box in self.hud_font.update(self.profile, (0, 0), self.profile_text, text, (255, 255, 0), (0, 0, 0, 255), 12):
+                self.renderer.mark((box[0], box[1] + self.profile_box[1], box[2], box[3] + self.profile_box[1]))
+            self.profile_text = text
+            self.profile_time = now
+        image.paste(self.profile.pixels, 0, self.profile_box[1])
 
     def draw_game_over(self):
         # 게임 오버 화면 그리기
+        self.renderer.flush()  # 표시 스레드의 전송이 끝난 뒤에 직접 그림
         image = self.over_background.copy()
-        draw = ImageDraw.Draw(image)
         text = 'GAME OVER'
-        text_width, text_height = draw.textsize(text, font=self.font)
+        text_width, text_height = self.font.size(text)
         position = ((240 - text_width) // 2, (240 - text_height) // 2)
-        draw.text(position, text, font=self.font, fill=(255, 0, 0))
+        self.font.draw(image, position, text, (255, 0, 0))
         self.joystick.disp.image(image)
         time.sleep(3)
 
     def draw_game_clear(self):
         # 게임 클리어 화면 그리기
+        self.renderer.flush()
         image = self.clear_background.copy()
-        draw = ImageDraw.Draw(image)
         text = 'GAME CLEAR'
-        text_width, text_height = draw.textsize(text, font=self.font)
+        text_width, text_height = self.font.size(text)
         position = ((240 - text_width) // 2, (240 - text_height) // 2)
-        draw.text(position, text, font=self.font, fill=(0, 255, 0))
+        self.font.draw(image, position, text, (0, 255, 0))
         self.joystick.disp.image(image)
         time.sleep(3)
\ No newline at end of file
@@ -0,0 +1,129 @@
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+class GlyphFont:
+    def __init__(self, font):
+        # 글자마다 한 번만 래스터화한 마스크와 치수를 보관하고 문자열은 마스크를 붙여 그림
+        self.font = font
+        self.glyphs = {}
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def glyph(self, char):
+        # 글자 하나의 (마스크, 원점 기준 왼쪽 위 오프셋, 전진 폭)
+        glyph = self.glyphs.get(char)
+        if glyph is not None:
+            self.hits += 1
+            return glyph
+        self.misses += 1
+        left, top, right, bottom = self.font.getbbox(char)
+        mask = None
+        if right > left and bottom > top:
+            mask = Image.new('L', (right - left, bottom - top), 0)
+            ImageDraw.Draw(mask).text((-left, -top), char, font=self.font, fill=255)
+        glyph = self.glyphs[char] = (mask, (left, top), self.font.getlength(char))
+        return glyph
+
+    def preload(self, chars):
+        # 자주 쓰는 글자를 미리 래스터화
+        for char in chars:
+            self.glyph(char)
+
+    def layout(self, text, x=0):
+        # 각 글자의 x 위치 목록
+        positions = []
+        for char in text:
+            positions.append(round(x))
+            x += self.glyph(char)[2]
+        return positions
+
+    def size(self, text):
+        # 문자열의 (폭, 높이) (예전 textsize처럼 원점에서 잉크 끝까지)
+        width = 0.0
+        height = 0
+        for char in text:
+            mask, (left, top), advance = self.glyph(char)
+            if mask is not None:
+                height = max(height, top + mask.height)
+            width += advance
+        return round(width), height
+
+    def cell(self, text, index, x, y, height):
+        # index번째 글자가 차지하는 영역 (다시 그릴 때 지울 범위)
+        mask, (left, top), advance = self.glyph(text[index])
+        right = x + max(round(advance), left + (mask.width if mask is not None else 0))
+        return (x + min(0, left), y, right, y + height)
+
+    def draw(self, image, position, text, fill):
+        # 캐시된 글자 마스크를 붙여 문자열 그리기
+        x, y = position
+        for char, char_x in zip(text, self.layout(text, x)):
+            mask, (left, top), advance = self.glyph(char)
+            if mask is not None:
+                box = (char_x + left, y + top, char_x + left + mask.width, y + top + mask.height)
+                image.paste(fill, box, mask)
+
+    def draw_centered(self, image, y, text, fill, width=240):
+        # 가로 가운데 정렬로 그리기
+        text_width, _ = self.size(text)
+        self.draw(image, ((width - text_width) // 2, y), text, fill)
+
+    def sprite(self, char, fill, background):
+        # 배경색 위에 미리 섞어 둔 RGB565 글자 (글자 픽셀만 마스크로 표시, 빈 글자는 None)
+        key = (char, tuple(fill[:3]), tuple(background[:3]))
+        if key not in self.sprites:
+            mask = self.glyph(char)[0]
+            sprite = None
+            if mask is not None:
+                from Framebuffer import Sprite
+                blended = Image.composite(Image.new('RGB', mask.size, key[1]), Image.new('RGB', mask.size, key[2]), mask)
+                blended.putalpha(mask.point(lambda v: 255 if v else 0))
+                sprite = Sprite.from_image(blended)
+            self.sprites[key] = sprite
+        return self.sprites[key]
+
+    def put(self, image, char, x, y, fill, background):
+        # 글자 하나 그리기 (image: PIL 이미지 또는 RGB565 화면 버퍼)
+        mask, (left, top), advance = self.glyph(char)
+        if mask is None:
+            return
+        if hasattr(image, 'blit'):
+            image.blit(self.sprite(char, fill, background), x + left, y + top)
+        else:
+            image.paste(fill, (x + left, y + top, x + left + mask.width, y + top + mask.height), mask)
+
+    def update(self, image, position, old, new, fill, background, height):
+        # old에서 new로 바뀐 글자만 지우고 다시 그림 (바뀐 영역 목록 반환)
+        x, y = position
+        clear = image.fill if hasattr(image, 'blit') else lambda box, color: image.paste(color, box)
+        layout = self.layout(new, x)
+        if old is None or len(old) != len(new) or self.layout(old, x) != layout:
+            boxes = [(x, y, x + max(self.size(old or '')[0], self.size(new)[0]) + 1, y + height)]
+            clear(boxes[0], background)
+            for char, char_x in zip(new, layout):
+                self.put(image, char, char_x, y, fill, background)
+            return boxes
+        boxes = []
+        for index, char_x in enumerate(layout):
+            if old[index] == new[index]:
+                continue
+            box = self.cell(old, index, char_x, y, height)
+            new_box = self.cell(new, index, char_x, y, height)
+            box = (min(box[0], new_box[0]), y, max(box[2], new_box[2]), y + height)
+            clear(box, background)
+            self.put(image, new[index], char_x, y, fill, background)
+            boxes.append(box)
+        return boxes
+
+fonts = {}
+
+def glyph_font(path=None, size=10):
+    # 경로와 크기별로 공유하는 글리프 캐시 (path가 None이면 Pillow 기본 글꼴)
+    key = (path, size)
+    if key not in fonts:
+        font = ImageFont.load_default() if path is None else ImageFont.truetype(path, size)
+        fonts[key] = GlyphFont(font)
+    return fonts[key]
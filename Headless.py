@@ -0,0 +1,105 @@
+from PIL import Image
+import json
+import time
+
+BUTTONS = 'ABCUDLR'
+
+class ScriptFinished(Exception):
+    # 헤드리스 입력 스크립트가 끝났음을 알림
+    pass
+
+class MemoryDisplay:
+    def __init__(self, width=240, height=240, rotation=180):
+        # st7789.ST7789 대신 쓰는 메모리 디스플레이 (패널 내용을 이미지로 보관)
+        self.width = width
+        self.height = height
+        self.rotation = rotation
+        self.panel = Image.new('RGB', (width, height))
+        self.pushes = 0
+        self.bytes = 0
+        self.keep_frames = False
+        self.frames = []
+
+    def image(self, img, rotation=None, x=0, y=0):
+        # 드라이버와 같은 방식으로 회전 후 패널에 기록
+        if rotation is None:
+            rotation = self.rotation
+        if img.mode not in ('RGB', 'RGBA'):
+            raise ValueError("Image must be in mode RGB or RGBA")
+        if rotation != 0:
+            img = img.rotate(rotation, expand=True)
+        if x + img.width > self.width or y + img.height > self.height:
+            raise ValueError("Image must not exceed dimensions of display")
+        self.panel.paste(img.convert('RGB'), (x, y))
+        self.pushes += 1
+        self.bytes += img.width * img.height * 2
+        if self.keep_frames:
+            self.frames.append(self.screen())
+
+    def _block(self, x0, y0, x1, y1, data):
+        # 드라이버의 RGB565 블록 전송 (빅엔디언 바이트를 풀어 패널에 기록)
+        import numpy as np
+        from Framebuffer import RGB565, rgb888
+        width, height = x1 - x0 + 1, y1 - y0 + 1
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            raise ValueError("Block must not exceed dimensions of display")
+        pixels = np.frombuffer(data, dtype=RGB565).reshape(height, width)
+        self.panel.paste(Image.fromarray(rgb888(pixels), 'RGB'), (x0, y0))
+        self.pushes += 1
+        self.bytes += len(data)
+        if self.keep_frames:
+            self.frames.append(self.screen())
+
+    def fill(self, color=0):
+        # 화면 지우기
+        self.panel.paste((0, 0, 0) if color == 0 else color, (0, 0, self.width, self.height))
+
+    def show(self):
+        pass
+
+    def screen(self):
+        # 사용자가 보는 화면 (패널 회전을 되돌린 이미지)
+        return self.panel.rotate(-self.rotation, expand=True) if self.rotation else self.panel.copy()
+
+class ScriptedButton:
+    def __init__(self, backend, name):
+        # 스크립트에 따라 눌림 상태가 바뀌는 버튼 (실제 핀처럼 눌리면 False)
+        self.backend = backend
+        self.name = name
+
+    @property
+    def value(self):
+        return self.name not in self.backend.pressed()
+
+class HeadlessBackend:
+    def __init__(self, script=(), clock=time.perf_counter, keep_frames=False):
+        # 화면은 메모리에 보관하고 버튼 입력은 스크립트에서 가져오는 백엔드
+        # script: [(지속 시간(초), 누른 버튼 문자열), ...] 예) [(0.5, 'R'), (0.1, 'RA')]
+        self.disp = MemoryDisplay()
+        self.disp.keep_frames = keep_frames
+        self.clock = clock
+        self.steps = []
+        end = 0.0
+        for duration, buttons in script:
+            end += duration
+            self.steps.append((end, set(buttons)))
+        self.start_time = None
+        self.step_index = 0
+        self.buttons = {name: ScriptedButton(self, name) for name in BUTTONS}
+
+    def pressed(self):
+        # 현재 시각에 눌려 있는 버튼 집합
+        now = self.clock()
+        if self.start_time is None:
+            self.start_time = now
+        elapsed = now - self.start_time
+        while self.step_index < len(self.steps) and elapsed >= self.steps[self.step_index][0]:
+            self.step_index += 1
+        if self.step_index >= len(self.steps):
+            raise ScriptFinished()
+        return self.steps[self.step_index][1]
+
+def load_script(path):
+    # JSON 입력 스크립트 읽기: [[0.5, "R"], [0.1, "RA"], ...]
+    with open(path, 'r') as f:
+        return [(float(duration), buttons) for duration, buttons in json.load(f)]
@@ -0,0 +1,149 @@
+from collections import namedtuple
+import queue
+import threading
+import time
+
+# kind: 'press', 'release', 'held' (누르고 있는 동안 반복), time: 감지 시각 (clock 기준 초)
+ButtonEvent = namedtuple('ButtonEvent', 'kind button time')
+
+class Input:
+    def __init__(self, buttons, poll_interval=0.002, debounce=0.02, hold_delay=0.4, hold_repeat=0.15,
+                 clock=time.perf_counter):
+        # 백그라운드 스레드가 모든 버튼을 짧은 간격으로 읽어 눌림/뗌/유지 이벤트를 대기열로 전달
+        # 디바운스: 상태가 바뀌면 즉시 이벤트를 내고 debounce초 동안 같은 버튼의 변화(채터링)를 무시
+        self.buttons = buttons
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.hold_delay = hold_delay
+        self.hold_repeat = hold_repeat
+        self.clock = clock
+        self.queue = queue.Queue()
+        self.pressed = set()  # 현재 눌린 (디바운스를 거친) 버튼
+        self.changed_at = {name: float('-inf') for name in buttons}
+        self.next_held = {}
+        self.error = None
+        self.samples = 0
+        self.bounces = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        # 샘플링 스레드 시작
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.sample_loop, name='input', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        # 샘플링 스레드 종료
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def sample_loop(self):
+        # 일정 간격으로 버튼 읽기 (입력 스크립트 종료 같은 예외는 게임 스레드에서 다시 발생시킴)
+        try:
+            while self.running:
+                self.sample()
+                time.sleep(self.poll_interval)
+        except Exception as error:
+            self.error = error
+            self.queue.put(None)
+
+    def sample(self):
+        # 모든 버튼을 한 번 읽고 바뀐 상태를 이벤트로 변환
+        now = self.clock()
+        self.samples += 1
+        for name, button in self.buttons.items():
+            down = not button.value  # 풀업 입력이라 눌리면 False
+            if down != (name in self.pressed):
+                if now - self.changed_at[name] < self.debounce:
+                    self.bounces += 1
+                    continue
+                self.changed_at[name] = now
+                if down:
+                    self.pressed.add(name)
+                    self.next_held[name] = now + self.hold_delay
+                    self.queue.put(ButtonEvent('press', name, now))
+                else:
+                    self.pressed.discard(name)
+                    self.next_held.pop(name, None)
+                    self.queue.put(ButtonEvent('release', name, now))
+            elif down and now >= self.next_held[name]:
+                self.next_held[name] += self.hold_repeat
+                self.queue.put(ButtonEvent('held', name, now))
+
+    def check(self):
+        # 샘플링 스레드에서 난 예외를 호출한 스레드로 전달
+        if self.error is not None:
+            raise self.error
+
+    def get(self, timeout=None):
+        # 다음 이벤트가 올 때까지 대기 (시간 초과 시 None)
+        self.check()
+        try:
+            event = self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if event is None:
+            self.check()
+        return event
+
+    def events(self):
+        # 지금까지 쌓인 이벤트를 모두 꺼냄 (기다리지 않음)
+        self.check()
+        events = []
+        while True:
+            try:
+                event = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                self.check()
+            else:
+                events.append(event)
+        return events
+
+    def clear(self):
+        # 쌓인 이벤트 버리기 (화면 전환 시 이전 화면의 입력이 넘어가지 않도록)
+        self.events()
+
+    def is_pressed(self, name):
+        # 버튼이 지금 눌려 있는지
+        self.check()
+        return name in self.pressed
+
+def measure_latency(taps=100, tap_length=0.03, bounce=0.004, gap=0.05):
+    # 입력 스크립트로 짧은 탭(채터링 포함)을 재생해 감지 지연과 누락 수를 측정
+    from Headless import HeadlessBackend, ScriptFinished
+    script, edges = [], []
+    elapsed = 0.0
+    for _ in range(taps):
+        edges.append(elapsed)
+        for buttons, duration in (('A', bounce), ('', bounce), ('A', tap_length - 2 * bounce), ('', gap)):
+            script.append((duration, buttons))
+            elapsed += duration
+    backend = HeadlessBackend(script)
+    backend.pressed()  # 스크립트 시작 시각 고정
+    start = backend.start_time
+    latencies = []
+    handler = Input(backend.buttons)
+    handler.start()
+    try:
+        while True:
+            event = handler.get()
+            if event.kind == 'press':
+                latencies.append(time.perf_counter() - start - edges[len(latencies)])
+    except (ScriptFinished, IndexError):
+        pass
+    handler.stop()
+    latencies.sort()
+    print(f'{len(latencies)}/{taps} taps detected, {handler.bounces} bounces ignored, {handler.samples} samples')
+    if latencies:
+        print(f'latency median {latencies[len(latencies) // 2] * 1000:.2f} ms, '
+              f'max {latencies[-1] * 1000:.2f} ms')
+
+if __name__ == '__main__':
+    # 사용법: python Input.py (스크립트 입력으로 감지 지연 측정)
+    measure_latency()
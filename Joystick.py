@@ -1,9 +1,36 @@
-from digitalio import DigitalInOut, Direction
-from adafruit_rgb_display import st7789
-import board
+from Input import Input
 
 class Joystick:
+    def __init__(self, backend=None):
+        # 디스플레이와 버튼 7개를 백엔드에서 가져옴 (기본: 라즈베리 파이 하드웨어)
+        if backend is None:
+            backend = PiBackend()
+        self.backend = backend
+        self.disp = backend.disp
+
+        # Input pins:
+        self.button_A = backend.buttons['A']
+        self.button_B = backend.buttons['B']
+        self.button_C = backend.buttons['C']
+        self.button_U = backend.buttons['U']
+        self.button_D = backend.buttons['D']
+        self.button_L = backend.buttons['L']
+        self.button_R = backend.buttons['R']
+
+        self.width = self.disp.width
+        self.height = self.disp.height
+
+        # 버튼 이벤트 (백그라운드 샘플링 + 디바운스)
+        self.input = Input(backend.buttons)
+        self.input.start()
+
+class PiBackend:
     def __init__(self):
+        # 라즈베리 파이 ST7789 디스플레이와 GPIO 버튼
+        from digitalio import DigitalInOut, Direction
+        from adafruit_rgb_display import st7789
+        import board
+
         self.cs_pin = DigitalInOut(board.CE0)
         self.dc_pin = DigitalInOut(board.D25)
         self.reset_pin = DigitalInOut(board.D24)
@@ -22,33 +49,14 @@ class Joystick:
                     )
 
         # Input pins:
-        self.button_A = DigitalInOut(board.D5)
-        self.button_A.direction = Direction.INPUT
-
-        self.button_B = DigitalInOut(board.D6)
-        self.button_B.direction = Direction.INPUT
-
-        self.button_L = DigitalInOut(board.D27)
-        self.button_L.direction = Direction.INPUT
-
-        self.button_R = DigitalInOut(board.D23)
-        self.button_R.direction = Direction.INPUT
-
-        self.button_U = DigitalInOut(board.D17)
-        self.button_U.direction = Direction.INPUT
-
-        self.button_D = DigitalInOut(board.D22)
-        self.button_D.direction = Direction.INPUT
-
-        self.button_C = DigitalInOut(board.D4)
-        self.button_C.direction = Direction.INPUT
+        self.buttons = {}
+        for name, pin in (('A', board.D5), ('B', board.D6), ('L', board.D27), ('R', board.D23),
+                          ('U', board.D17), ('D', board.D22), ('C', board.D4)):
+            button = DigitalInOut(pin)
+            button.direction = Direction.INPUT
+            self.buttons[name] = button
 
         # Turn on the Backlight
         self.backlight = DigitalInOut(board.D26)
         self.backlight.switch_to_output()
         self.backlight.value = True
-
-        # Create blank image for drawing.
-        # Make sure to create image with mode 'RGB' for color.
-        self.width = self.disp.width
-        self.height = self.disp.height
\ No newline at end of file
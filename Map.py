@@ -1,69 +1,257 @@
-import random
-from PIL import Image
-import os
+import numpy as np
+from Framebuffer import RGB565
+from Assets import assets, HIVES
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-asset_path = os.path.join(current_dir, 'assets')
+# 청크 한 변의 칸 수 (2의 거듭제곱)
+CHUNK_SHIFT = 5
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# 칸 하나를 1바이트로 압축: 0-1비트 블록 종류, 2비트 이동 가능, 3비트 파괴 가능, 4-7비트 이동 가능한 이웃
+TYPE_MASK = 0x03
+WALKABLE = 0x04
+DIGGABLE = 0x08
+NEIGHBOR_SHIFT = 4
+# 블록 종류별 플래그 (0: 빈칸, 1: 일반 블록, 2: 특수 블록)
+BLOCK_FLAGS = bytes([WALKABLE, DIGGABLE, DIGGABLE])
+# 이웃 방향 (비트 순서, 반대 방향은 비트 번호 ^ 1)
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+# 이웃 비트 마스크 -> 이동 가능한 이웃 방향 목록 (조회할 때마다 목록을 만들지 않도록 미리 계산)
+NEIGHBOR_TABLE = tuple(tuple(d for i, d in enumerate(DIRECTIONS) if mask & (1 << i)) for mask in range(16))
 
 class Map:
-    def __init__(self, joystick):
+    def __init__(self, joystick, width=15, height=14):
+        # 월드 크기(칸)는 자유롭게, 화면에는 카메라가 보는 15x14 칸만 그림
         self.joystick = joystick
-        self.width = 15
-        self.height = 14
-        self.grid = []
+        self.width = width
+        self.height = height
+        self.view_width = min(width, 15)
+        self.view_height = min(height, 14)
+        self.camera_x = 0
+        self.camera_y = 0
+        # 청크 단위 블록 저장소: (청크 x, 청크 y) -> 연속된 bytearray (칸마다 압축된 1바이트)
+        self.chunks = {}
+        self.modified_chunks = set()  # 플레이 중 바뀐 청크 (버리면 안 됨)
+        self.max_cached_chunks = 64
+        self.seed = 0
         self.block_images = {
-            0: Image.open(os.path.join(asset_path, 'blocks/noblock.png')).resize((16, 16)),
-            1: Image.open(os.path.join(asset_path, 'blocks/normal_block.png')).resize((16, 16)),
-            2: Image.open(os.path.join(asset_path, 'blocks/special_block.png')).resize((16, 16))
+            0: assets.sprite('blocks/noblock.png', (16, 16)),
+            1: assets.sprite('blocks/normal_block.png', (16, 16)),
+            2: assets.sprite('blocks/special_block.png', (16, 16))
         }
-        self.hive_images = [
-            Image.open(os.path.join(asset_path, 'hive1.png')).resize((16, 16)),
-            Image.open(os.path.join(asset_path, 'hive2.png')).resize((16, 16))
-        ]
+        self.hive_images = assets.sprite_frames(HIVES, (16, 16))
         self.hive_x = self.width - 1
         self.hive_y = self.height - 1
         self.hive_state = 1
         self.enemies_spawned = 0
+        # 미리 합성해 둔 (카메라 영역) 블록 배경 레이어와 다시 그려야 할 칸 목록
+        self.layer = np.zeros((self.view_height * 16, self.view_width * 16), dtype=RGB565)
+        self.layer_camera = None
+        self.dirty_tiles = set()
+        self.layer_valid = False
+        self.drawn_hive_state = None
+        self.version = 0  # 블록이 바뀔 때마다 증가 (경로 탐색 캐시 무효화용)
+
+    def generate_map(self, seed):
+        # 맵 생성 (청크는 처음 접근할 때 시드로부터 만들어짐, 같은 시드면 같은 맵)
+        self.seed = seed
+        self.chunks.clear()
+        self.modified_chunks.clear()
+        self.camera_x = self.camera_y = 0
+        # 맵 전체가 바뀌었으므로 레이어 전체를 다시 그림
+        self.layer_valid = False
+        self.dirty_tiles.clear()
+        self.version += 1
+
+    def corridor_span(self, y):
+        # y번째 줄에서 처음부터 뚫려 있는 통로의 x 범위 (왼쪽 위에서 본거지까지 이어지는 계단)
+        def start(row):
+            return row * (self.width - 2) // max(self.height - 1, 1)
+        x0 = start(y)
+        x1 = max(x0 + 1, start(min(y + 1, self.height - 1)))
+        return x0, x1
+
+    def generated_block(self, x, y):
+        # 시드와 좌표만으로 정해지는 처음 블록 종류 (통로는 빈칸, 나머지는 30% 확률로 특수 블록)
+        x0, x1 = self.corridor_span(y)
+        if x0 <= x <= x1:
+            return 0
+        return 2 if cell_noise(self.seed, x, y) < 0.3 else 1
+
+    def block_at(self, x, y):
+        # 청크를 새로 만들지 않고 블록 종류 조회 (없는 청크는 처음 블록 종류, 맵 밖은 None)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        chunk = self.chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT))
+        if chunk is None:
+            return self.generated_block(x, y)
+        return chunk[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)] & TYPE_MASK
+
+    def generate_chunk(self, chunk_x, chunk_y):
+        # 청크 생성: 블록 종류와 플래그, 이동 가능한 이웃 마스크를 한 번에 계산
+        chunk = bytearray(CHUNK_SIZE * CHUNK_SIZE)
+        base_x, base_y = chunk_x << CHUNK_SHIFT, chunk_y << CHUNK_SHIFT
+        for local_y in range(CHUNK_SIZE):
+            for local_x in range(CHUNK_SIZE):
+                block = self.generated_block(base_x + local_x, base_y + local_y)
+                chunk[(local_y << CHUNK_SHIFT) | local_x] = block | BLOCK_FLAGS[block]
+        for local_y in range(CHUNK_SIZE):
+            for local_x in range(CHUNK_SIZE):
+                x, y = base_x + local_x, base_y + local_y
+                mask = 0
+                for bit, (dx, dy) in enumerate(DIRECTIONS):
+                    nx, ny = local_x + dx, local_y + dy
+                    if 0 <= nx < CHUNK_SIZE and 0 <= ny < CHUNK_SIZE:
+                        walkable = chunk[(ny << CHUNK_SHIFT) | nx] & WALKABLE and 0 <= x + dx < self.width and 0 <= y + dy < self.height
+                    else:
+                        walkable = self.block_at(x + dx, y + dy) == 0
+                    if walkable:
+                        mask |= 1 << bit
+                chunk[(local_y << CHUNK_SHIFT) | local_x] |= mask << NEIGHBOR_SHIFT
+        return chunk
+
+    def chunk(self, chunk_x, chunk_y):
+        # 청크 조회 (없으면 생성)
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.generate_chunk(chunk_x, chunk_y)
+            self.chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def cell(self, x, y):
+        # 칸의 압축된 바이트 (맵 밖이면 0: 이동/파괴 불가)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.chunk(x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)[((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)]
+        return 0
+
+    def get(self, x, y):
+        # 칸의 블록 종류 (맵 밖이면 None)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cell(x, y) & TYPE_MASK
+        return None
 
-    def generate_map(self):
-        # 맵 생성
-        self.grid = [
-            [0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1],
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0]
-        ]
-        # 30%의 확률로 1을 2로 무작위 변환
-        for row in self.grid:
-            for i in range(len(row)):
-                if row[i] == 1 and random.random() < 0.3:
-                    row[i] = 2
-
-    def draw(self, image):
-        # 맵 그리기
-        for y in range(self.height):
-            for x in range(self.width):
-                block_type = self.grid[y][x]
-                image.paste(self.block_images[block_type], (x * 16, y * 16 + 16))
-
-        if self.hive_state > 0:
-            hive_image = self.hive_images[self.hive_state - 1]
-            image.paste(hive_image, (self.hive_x * 16, self.hive_y * 16 + 16), hive_image)
+    def is_walkable(self, x, y):
+        # 이동 가능한 빈칸인지
+        return bool(self.cell(x, y) & WALKABLE)
+
+    def is_diggable(self, x, y):
+        # 파괴 가능한 블록인지
+        return bool(self.cell(x, y) & DIGGABLE)
+
+    def walkable_neighbors(self, x, y):
+        # 이동 가능한 이웃 방향 목록 (미리 계산된 표에서 조회)
+        return NEIGHBOR_TABLE[self.cell(x, y) >> NEIGHBOR_SHIFT]
+
+    def set_block(self, x, y, block_type):
+        # 블록 변경 (플래그와 이웃 마스크 갱신, 바뀐 칸은 다음 프레임에 레이어에 다시 그림)
+        key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT)
+        chunk = self.chunk(*key)
+        index = ((y & CHUNK_MASK) << CHUNK_SHIFT) | (x & CHUNK_MASK)
+        old = chunk[index]
+        if old & TYPE_MASK == block_type:
+            return
+        chunk[index] = (old & ~(TYPE_MASK | WALKABLE | DIGGABLE)) | block_type | BLOCK_FLAGS[block_type]
+        self.modified_chunks.add(key)
+        if (old ^ chunk[index]) & WALKABLE:
+            # 이웃 칸들의 "이 칸으로 이동 가능" 비트 갱신
+            walkable = chunk[index] & WALKABLE
+            for bit, (dx, dy) in enumerate(DIRECTIONS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < self.width and 0 <= ny < self.height):
+                    continue
+                neighbor_chunk = self.chunks.get((nx >> CHUNK_SHIFT, ny >> CHUNK_SHIFT))
+                if neighbor_chunk is None:
+                    continue  # 아직 없는 청크는 생성될 때 이 칸을 보고 계산함
+                neighbor_index = ((ny & CHUNK_MASK) << CHUNK_SHIFT) | (nx & CHUNK_MASK)
+                toward = 1 << ((bit ^ 1) + NEIGHBOR_SHIFT)
+                if walkable:
+                    neighbor_chunk[neighbor_index] |= toward
+                else:
+                    neighbor_chunk[neighbor_index] &= ~toward
+        self.dirty_tiles.add((x, y))
+        self.version += 1
+
+    def update_camera(self, player_x, player_y):
+        # 플레이어를 화면 가운데에 두도록 카메라 이동 (칸 단위, 맵 밖으로는 나가지 않음)
+        camera_x = min(max(int(player_x) - self.view_width // 2, 0), self.width - self.view_width)
+        camera_y = min(max(int(player_y) - self.view_height // 2, 0), self.height - self.view_height)
+        if (camera_x, camera_y) != (self.camera_x, self.camera_y):
+            self.camera_x, self.camera_y = camera_x, camera_y
+            self.trim_chunks()
+
+    def trim_chunks(self):
+        # 카메라에서 먼, 바뀌지 않은 청크는 버림 (다시 필요하면 시드로 다시 생성)
+        if len(self.chunks) <= self.max_cached_chunks:
+            return
+        center_x = (self.camera_x + self.view_width // 2) >> CHUNK_SHIFT
+        center_y = (self.camera_y + self.view_height // 2) >> CHUNK_SHIFT
+        for key in list(self.chunks):
+            if key not in self.modified_chunks and max(abs(key[0] - center_x), abs(key[1] - center_y)) > 1:
+                del self.chunks[key]
+
+    def draw_tile(self, x, y):
+        # 월드 칸 하나를 레이어에 그림
+        layer_x, layer_y = (x - self.camera_x) * 16, (y - self.camera_y) * 16
+        self.layer[layer_y:layer_y + 16, layer_x:layer_x + 16] = self.block_images[self.get(x, y)].pixels
+
+    def refresh_layer(self):
+        # 바뀐 칸만 레이어에 다시 그리고 다시 그린 화면 영역 목록을 반환
+        camera = (self.camera_x, self.camera_y)
+        full_box = (0, 16, self.view_width * 16, self.view_height * 16 + 16)
+        if not self.layer_valid or self.layer_camera is None:
+            for y in range(self.camera_y, self.camera_y + self.view_height):
+                for x in range(self.camera_x, self.camera_x + self.view_width):
+                    self.draw_tile(x, y)
+            self.layer_valid = True
+            boxes = [full_box]
+        elif camera != self.layer_camera:
+            # 카메라가 움직였으면 기존 레이어를 밀고 새로 드러난 칸만 그림
+            dx, dy = camera[0] - self.layer_camera[0], camera[1] - self.layer_camera[1]
+            height, width = self.layer.shape
+            shift_x, shift_y = dx * 16, dy * 16
+            if abs(shift_x) < width and abs(shift_y) < height:
+                # 겹치는 부분을 제자리에서 옮김 (numpy가 겹침을 처리)
+                self.layer[max(-shift_y, 0):height - max(shift_y, 0), max(-shift_x, 0):width - max(shift_x, 0)] = \
+                    self.layer[max(shift_y, 0):height - max(-shift_y, 0), max(shift_x, 0):width - max(-shift_x, 0)]
+            for y in range(self.camera_y, self.camera_y + self.view_height):
+                for x in range(self.camera_x, self.camera_x + self.view_width):
+                    old_x, old_y = x - self.layer_camera[0], y - self.layer_camera[1]
+                    if not (0 <= old_x < self.view_width and 0 <= old_y < self.view_height):
+                        self.draw_tile(x, y)
+            boxes = [full_box]
+        else:
+            boxes = []
+        for x, y in self.dirty_tiles:
+            if self.in_view(x, y):
+                self.draw_tile(x, y)
+                screen_x, screen_y = (x - self.camera_x) * 16, (y - self.camera_y) * 16 + 16
+                boxes.append((screen_x, screen_y, screen_x + 16, screen_y + 16))
+        self.layer_camera = camera
+        self.dirty_tiles.clear()
+        return boxes
+
+    def in_view(self, x, y):
+        # 칸이 카메라 영역 안에 있는지
+        return self.camera_x <= x < self.camera_x + self.view_width and self.camera_y <= y < self.camera_y + self.view_height
+
+    def draw(self, frame):
+        # 맵 그리기 (frame: RGB565 화면 버퍼, 화면에서 바뀐 영역 목록을 반환)
+        boxes = self.refresh_layer()
+        frame.paste(self.layer, 0, 16)
+
+        hive_box = ((self.hive_x - self.camera_x) * 16, (self.hive_y - self.camera_y) * 16 + 16)
+        hive_box = hive_box + (hive_box[0] + 16, hive_box[1] + 16)
+        if self.hive_state > 0 and self.in_view(self.hive_x, self.hive_y):
+            frame.blit(self.hive_images[self.hive_state - 1], *hive_box[:2])
+        if self.hive_state != self.drawn_hive_state:
+            boxes.append(hive_box)
+            self.drawn_hive_state = self.hive_state
+        return boxes
 
     def destroy_block(self, x, y):
         # 블록 파괴
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x] = 0
+            self.set_block(x, y, 0)
 
     def upgrade_hive(self):
         # 적의 본거지 사냥 가능화
@@ -73,4 +261,10 @@ class Map:
     def destroy_hive(self):
         # 적의 본거지 파괴
         self.hive_state = 0
-        self.grid[self.hive_y][self.hive_x] = 0
\ No newline at end of file
+        self.set_block(self.hive_x, self.hive_y, 0)
+
+def cell_noise(seed, x, y):
+    # 좌표별로 정해지는 0~1 사이 의사 난수 (청크 순서와 무관하게 같은 값)
+    h = (x * 374761393 + y * 668265263 + seed * 2246822519) & 0xffffffff
+    h = ((h ^ (h >> 13)) * 1274126177) & 0xffffffff
+    return (h ^ (h >> 16)) / 4294967296
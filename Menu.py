@@ -1,58 +1,74 @@
-from PIL import Image, ImageDraw, ImageFont
-import time
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-asset_path = os.path.join(current_dir, 'assets')
+from Glyphs import glyph_font, FONT_REGULAR
+from Assets import assets
+from Renderer import Renderer
+from Profiler import profiler
 
 class Menu:
     def __init__(self, joystick):
         self.joystick = joystick
-        self.background = Image.open(os.path.join(asset_path, 'background.png')).resize((240, 240))
-        self.font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 20)
-        self.small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
+        self.background = assets.get('background.png', (240, 240))
+        self.font = glyph_font(FONT_REGULAR, 20)
+        self.small_font = glyph_font(FONT_REGULAR, 16)
         self.options = ['easy', 'medium', 'hard', 'exit']
         self.selected = 0
         self.text_color = (0, 0, 139)
         self.highlight_color = (255, 255, 0) 
+        self.frames = {}
+        self.renderer = Renderer(joystick.disp)
+        self.shown = None  # 화면에 떠 있는 선택 상태 (None: 다른 화면이 떠 있음)
 
-    def display(self):
-        # 메뉴 표시
-        while True:
+    def render(self, selected):
+        # 선택 상태별 메뉴 화면 (한 번 그린 뒤 재사용)
+        if selected not in self.frames:
             image = self.background.copy()
-            draw = ImageDraw.Draw(image)
 
             # 타이틀 그리기
             title = "Underground Expedition"
-            title_width, title_height = draw.textsize(title, font=self.font)
+            title_width, title_height = self.font.size(title)
             title_position = ((240 - title_width) // 2, 40)
-            draw.text(title_position, title, font=self.font, fill=self.text_color)
+            self.font.draw(image, title_position, title, self.text_color)
 
             # 옵션 그리기
             for i, option in enumerate(self.options):
-                color = self.highlight_color if i == self.selected else self.text_color
-                option_width, option_height = draw.textsize(option, font=self.small_font)
+                color = self.highlight_color if i == selected else self.text_color
+                option_width, option_height = self.small_font.size(option)
                 option_position = ((240 - option_width) // 2, 120 + i * 30)
-                draw.text(option_position, option, font=self.small_font, fill=color)
+                self.small_font.draw(image, option_position, option, color)
+            self.frames[selected] = image
+        return self.frames[selected]
+
+    def option_box(self, index):
+        # 옵션 한 줄이 차지하는 화면 영역
+        return (0, 120 + index * 30, 240, 150 + index * 30)
 
-            self.joystick.disp.image(image)
+    def show(self):
+        # 현재 선택 상태를 화면에 전송 (바뀐 두 줄만, 처음이면 전체)
+        if self.shown is None:
+            self.renderer.invalidate()
+        else:
+            self.renderer.mark(self.option_box(self.shown))
+            self.renderer.mark(self.option_box(self.selected))
+        with profiler.section('menu.render'):
+            image = self.render(self.selected)
+        with profiler.section('menu.present'):
+            self.renderer.present(image)
+        self.shown = self.selected
+
+    def display(self):
+        # 메뉴 표시 (선택이 바뀐 경우에만 화면을 전송하고 그 외에는 입력을 기다림)
+        self.joystick.input.clear()
+        while True:
+            if self.selected != self.shown:
+                self.show()
 
-            # 사용자 입력 처리
-            if not self.joystick.button_U.value:
+            # 사용자 입력 처리 (누르고 있으면 held 이벤트로 반복 이동)
+            event = self.joystick.input.get()
+            if event is None or event.kind == 'release':
+                continue
+            if event.button == 'U':
                 self.selected = (self.selected - 1) % len(self.options)
-                time.sleep(0.2)
-            elif not self.joystick.button_D.value:
+            elif event.button == 'D':
                 self.selected = (self.selected + 1) % len(self.options)
-                time.sleep(0.2)
-            elif not self.joystick.button_A.value:
-                if self.selected == 0:
-                    return 'easy'
-                elif self.selected == 1:
-                    return 'medium'
-                elif self.selected == 2:
-                    return 'hard'
-                elif self.selected == 3:
-                    return 'exit'
-                time.sleep(0.2)
-
-            time.sleep(0.1)
\ No newline at end of file
+            elif event.button == 'A' and event.kind == 'press':
+                self.shown = None
+                return self.options[self.selected]
@@ -0,0 +1,49 @@
+from collections import deque
+import time
+
+class ReplanScheduler:
+    def __init__(self, budget_us=2000):
+        # 적 경로 재계산 요청을 모아 프레임당 시간 예산(마이크로초) 안에서 처리
+        # budget_us가 None이면 예산 없이 모두 처리 (처리량이 기계 속도에 좌우되지 않도록, 재현 실행용)
+        self.budget_us = budget_us
+        self.queue = deque()
+        self.queued = set()
+        self.last_spent_us = 0
+        self.last_processed = 0
+        self.max_depth = 0
+
+    def request(self, enemy):
+        # 경로 재계산 요청 (이미 대기 중이면 무시)
+        if enemy not in self.queued:
+            self.queued.add(enemy)
+            self.queue.append(enemy)
+            self.max_depth = max(self.max_depth, len(self.queue))
+
+    def clear(self):
+        # 대기 중인 요청 모두 취소
+        self.queue.clear()
+        self.queued.clear()
+
+    def run(self, flow_field, player_x, player_y):
+        # 예산 안에서 먼저 요청한 적부터 경로를 다시 계산 (최소 한 개는 처리)
+        start = time.perf_counter()
+        deadline = None if self.budget_us is None else start + self.budget_us / 1000000
+        processed = 0
+        if self.queue:
+            flow_field.update(player_x, player_y)
+        while self.queue:
+            enemy = self.queue.popleft()
+            self.queued.discard(enemy)
+            if enemy.removed or enemy.is_dying:
+                continue
+            enemy.replan()
+            processed += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.last_spent_us = (time.perf_counter() - start) * 1000000
+        self.last_processed = processed
+
+    def stats(self):
+        # 대기열 길이와 이번 프레임에 쓴 시간
+        return {'queue_depth': len(self.queue), 'max_depth': self.max_depth,
+                'spent_us': round(self.last_spent_us), 'processed': self.last_processed}
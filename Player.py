@@ -1,9 +1,4 @@
-import time
-from PIL import Image, ImageOps
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-asset_path = os.path.join(current_dir, 'assets')
+from Assets import assets, PLAYER_MOVE, PLAYER_DIG
 
 class Player:
     def __init__(self, joystick, game):
@@ -13,17 +8,16 @@ class Player:
         self.y = 0
         self.width = 16
         self.height = 16
-        self.speed = 0.5
-        self.lasers = []
-        self.last_laser_time = 0
+        self.speed = 10.0  # 초당 이동 칸 수
+        self.last_laser_time = float('-inf')
         self.laser_cooldown = 2.5
         self.dig_time = 0
         self.dig_duration = 0.5
         self.facing_right = True
-        self.move_images = [make_transparent(Image.open(os.path.join(asset_path, f'player/move/{i}.png')).resize((16, 16)).convert('RGBA')) for i in range(1, 8)]
-        self.move_images_right = [ImageOps.mirror(img) for img in self.move_images]
-        self.dig_images = [make_transparent(Image.open(os.path.join(asset_path, f'player/dig/d{i}.png')).resize((16, 16)).convert('RGBA')) for i in range(1, 3)]
-        self.dig_images_right = [ImageOps.mirror(img) for img in self.dig_images]
+        self.move_images = assets.sprite_frames(PLAYER_MOVE, (16, 16), transparent=True)
+        self.move_images_right = assets.sprite_frames(PLAYER_MOVE, (16, 16), transparent=True, mirrored=True)
+        self.dig_images = assets.sprite_frames(PLAYER_DIG, (16, 16), transparent=True)
+        self.dig_images_right = assets.sprite_frames(PLAYER_DIG, (16, 16), transparent=True, mirrored=True)
         self.is_digging = False
         self.dig_direction = None
         self.laser_direction = None
@@ -34,17 +28,23 @@ class Player:
         # 플레이어 위치 및 상태 초기화
         self.x = 0
         self.y = 0
-        self.lasers = []
+        self.game.projectiles.clear()
         self.is_digging = False
-        
-    def flip_image(self):
-        # 플레이어 이미지 좌우 반전
-        if not self.facing_right:
-            self.current_image = ImageOps.mirror(self.current_image)
 
+    def start(self):
+        # 새 게임 시작 시 초기화 (피격 때와 달리 방향, 쿨다운, 애니메이션까지 처음 상태로)
+        self.reset()
+        self.last_laser_time = float('-inf')
+        self.dig_time = float('-inf')
+        self.dig_direction = None
+        self.laser_direction = None
+        self.facing_right = True
+        self.animation_index = 0
+        self.current_image = self.move_images[0]
+        
     def update_image(self):
         # 플레이어 이미지 업데이트
-        current_time = time.time()
+        current_time = self.game.clock()
         if self.is_digging and current_time - self.dig_time < self.dig_duration:
             dig_index = int((current_time - self.dig_time) / (self.dig_duration / 2))
             if self.facing_right:
@@ -57,18 +57,19 @@ class Player:
             else:
                 self.current_image = self.move_images[self.animation_index]
 
-    def move(self, direction):
+    def move(self, direction, dt):
         # 플레이어 이동
         new_x, new_y = self.x, self.y
+        step = self.speed * dt
         if direction == 'up' and self.y > 0:
-            new_y -= self.speed
-        elif direction == 'down' and self.y < 13:
-            new_y += self.speed
+            new_y -= step
+        elif direction == 'down' and self.y < self.game.map.height - 1:
+            new_y += step
         elif direction == 'left' and self.x > 0:
-            new_x -= self.speed
+            new_x -= step
             self.facing_right = False
-        elif direction == 'right' and self.x < 14:
-            new_x += self.speed
+        elif direction == 'right' and self.x < self.game.map.width - 1:
+            new_x += step
             self.facing_right = True
 
         if self.game.can_move(int(new_x), int(new_y)):
@@ -81,9 +82,11 @@ class Player:
 
     def shoot_laser(self):
         # 레이저 발사
-        current_time = time.time()
-        if current_time - self.last_laser_time >= self.laser_cooldown and self.laser_direction:
-            self.lasers.append(Laser(self.x, self.y, self.laser_direction))
+        current_time = self.game.clock()
+        projectiles = self.game.projectiles
+        if (current_time - self.last_laser_time >= self.laser_cooldown and self.laser_direction
+                and projectiles.live < projectiles.capacity):
+            projectiles.spawn(self.x, self.y, self.laser_direction, Laser.SPEED)
             self.last_laser_time = current_time
 
     def dig(self):
@@ -101,75 +104,53 @@ class Player:
 
             if self.game.can_dig(dig_x, dig_y):
                 self.game.destroy_block(dig_x, dig_y)
-                self.dig_time = time.time()
+                self.dig_time = self.game.clock()
                 self.is_digging = True
 
-    def update(self):
+    def update(self, dt):
         # 플레이어 상태 업데이트
-        current_time = time.time()
+        current_time = self.game.clock()
         if self.is_digging and current_time - self.dig_time >= self.dig_duration:
             self.is_digging = False
 
-        for laser in self.lasers:
-            laser.update()
-            if laser.x > 14 or laser.x < 0 or laser.y > 13 or laser.y < 0:
-                self.lasers.remove(laser)
-
         self.update_image()
 
-    def draw(self, image):
-        # 플레이어 및 레이저 그리기
-        image.paste(self.current_image, (int(self.x * 16), int(self.y * 16 + 16)), self.current_image)
-        for laser in self.lasers:
-            laser.draw(image)
+    def draw(self, frame, camera=(0, 0)):
+        # 플레이어 및 레이저 그리기 (frame: RGB565 화면 버퍼, camera: 화면 왼쪽 위의 월드 칸 좌표)
+        frame.blit(self.current_image, int((self.x - camera[0]) * 16), int((self.y - camera[1]) * 16 + 16))
+        projectiles = self.game.projectiles
+        for index in range(projectiles.live):
+            projectiles.views[index].draw(frame, camera)
 
-    def collides_with(self, other):
-        # 다른 객체와의 충돌 검사
-        return (self.x == other.x and self.y == other.y)
+    def box(self, camera=(0, 0)):
+        # 화면에 그려지는 영역
+        x, y = int((self.x - camera[0]) * 16), int((self.y - camera[1]) * 16 + 16)
+        return (x, y, x + 16, y + 16)
 
 class Laser:
-    def __init__(self, x, y, direction):
-        # 레이저 초기화
-        self.x = x
-        self.y = y
-        self.direction = direction
-        self.speed = 0.3
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        missile_path = os.path.join(asset_path, 'missile.png')
-        self.image = make_transparent(Image.open(missile_path).convert("RGBA").resize((8, 8)))
-
-    def update(self):
-        # 레이저 위치 업데이트
-        if self.direction == 'up':
-            self.y -= self.speed
-        elif self.direction == 'down':
-            self.y += self.speed
-        elif self.direction == 'left':
-            self.x -= self.speed
-        elif self.direction == 'right':
-            self.x += self.speed
-
-    def draw(self, image):
-        # 레이저 그리기
-        image.paste(self.image, (int(self.x * 16 + 4), int(self.y * 16 + 20)), self.image)
+    __slots__ = ('store', 'slot', 'image')
+    SPEED = 12.0  # 초당 이동 칸 수 (예전에는 6.0이었지만 한 틱에 두 번 이동해 실제로는 12칸)
 
-    def collides_with(self, other):
-        # 다른 객체와의 충돌 검사
-        return (abs(self.x - other.x) < 1 and abs(self.y - other.y) < 1)
+    def __init__(self, store, slot):
+        # 발사체 저장소(Projectiles)의 한 자리를 가리키는 얇은 뷰 (이동과 충돌은 저장소가 일괄 처리)
+        # 자리마다 한 번만 만들고 그 자리로 오는 레이저마다 다시 씀
+        self.store = store
+        self.slot = slot
+        self.image = assets.sprite('missile.png', (8, 8), transparent=True)
 
-    def collides_with_hive(self, hive_x, hive_y):
-        # 적의 본거지와의 충돌 검사
-        return (abs(self.x - hive_x) < 1 and abs(self.y - hive_y) < 1)
-    
-def make_transparent(image):
-    # 이미지 배경을 투명하게 만듦
-    image = image.convert("RGBA")
-    data = image.getdata()
-    new_data = []
-    for item in data:
-        if item[0] == 0 and item[1] == 0 and item[2] == 0:  # 검은색인 경우
-            new_data.append((0, 0, 0, 0))  # 완전 투명으로 설정
-        else:
-            new_data.append(item)
-    image.putdata(new_data)
-    return image
\ No newline at end of file
+    @property
+    def x(self):
+        return float(self.store.x[self.slot])
+
+    @property
+    def y(self):
+        return float(self.store.y[self.slot])
+
+    def draw(self, frame, camera=(0, 0)):
+        # 레이저 그리기
+        frame.blit(self.image, int((self.x - camera[0]) * 16 + 4), int((self.y - camera[1]) * 16 + 20))
+
+    def box(self, camera=(0, 0)):
+        # 화면에 그려지는 영역
+        x, y = int((self.x - camera[0]) * 16 + 4), int((self.y - camera[1]) * 16 + 20)
+        return (x, y, x + 8, y + 8)
@@ -0,0 +1,158 @@
+import csv
+import gc
+import json
+import threading
+import time
+
+class Section:
+    def __init__(self, profiler, name):
+        # with 블록 하나의 시간 측정
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, self.profiler.clock() - self.start)
+        return False
+
+class NullSection:
+    # 측정을 끈 동안 쓰는 빈 with 블록 (아무것도 기록하지 않음)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class Profiler:
+    def __init__(self, capacity=8192, clock=time.perf_counter):
+        # 단계별 소요 시간을 고정 크기 링 버퍼에 기록 (가득 차면 가장 오래된 기록부터 덮어씀)
+        self.capacity = capacity
+        self.clock = clock
+        self.enabled = False
+        self.names = [None] * capacity
+        self.starts = [0.0] * capacity
+        self.durations = [0.0] * capacity
+        self.threads = [0] * capacity
+        self.index = 0
+        self.count = 0
+        self.thread_names = {}
+        self.origin = clock()
+        self.null = NullSection()
+
+    def section(self, name):
+        # 측정할 구간 (with profiler.section('update'): ...)
+        if not self.enabled:
+            return self.null
+        return Section(self, name)
+
+    def add(self, name, start, duration):
+        # 기록 하나 추가 (다른 스레드에서 불러도 됨, 같은 칸을 동시에 쓰는 경우는 드물고 무해함)
+        thread = threading.get_ident()
+        if thread not in self.thread_names:
+            self.thread_names[thread] = threading.current_thread().name
+        index = self.index
+        self.names[index] = name
+        self.starts[index] = start
+        self.durations[index] = duration
+        self.threads[index] = thread
+        self.index = (index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def records(self):
+        # 남아 있는 기록을 오래된 순서로 [(이름, 스레드, 시작, 소요 시간), ...]
+        first = (self.index - self.count) % self.capacity
+        order = [(first + i) % self.capacity for i in range(self.count)]
+        return [(self.names[i], self.threads[i], self.starts[i], self.durations[i]) for i in order]
+
+    def clear(self):
+        # 기록 모두 지우기
+        self.index = 0
+        self.count = 0
+
+    def summary(self, window=1.0):
+        # 최근 window초 동안 구간별 (횟수, 평균 ms)
+        since = self.clock() - window
+        totals = {}
+        for name, thread, start, duration in self.records():
+            if start >= since:
+                total = totals.setdefault(name, [0, 0.0])
+                total[0] += 1
+                total[1] += duration
+        return {name: (count, total / count * 1000) for name, (count, total) in totals.items()}
+
+    def dump(self, path):
+        # 기록을 파일로 저장 (.csv면 CSV, 그 외에는 chrome://tracing 형식 JSON)
+        records = self.records()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['name', 'thread', 'start_ms', 'duration_ms'])
+                for name, thread, start, duration in records:
+                    writer.writerow([name, self.thread_names.get(thread, thread),
+                                     f'{(start - self.origin) * 1000:.3f}', f'{duration * 1000:.3f}'])
+        else:
+            events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread, 'args': {'name': name}}
+                      for thread, name in self.thread_names.items()]
+            events += [{'name': name, 'ph': 'X', 'pid': 1, 'tid': thread,
+                        'ts': round((start - self.origin) * 1000000, 1), 'dur': round(duration * 1000000, 1)}
+                       for name, thread, start, duration in records]
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(records)
+
+class AllocationCounter:
+    def __init__(self):
+        # with 블록이 끝날 때 새로 생겨 남아 있는 (GC가 추적하는) 객체 수 (리스트, 딕셔너리, 일반 객체 등)
+        # 측정하는 동안 자동 수거를 꺼서 순환 참조로 남은 쓰레기도 함께 셈
+        self.objects = 0
+
+    def __enter__(self):
+        gc.collect()
+        self.was_enabled = gc.isenabled()
+        gc.disable()
+        self.start = len(gc.get_objects())
+        return self
+
+    def __exit__(self, *exc):
+        self.objects = len(gc.get_objects()) - self.start
+        if self.was_enabled:
+            gc.enable()
+        return False
+
+class CollectionMonitor:
+    def __init__(self, clock=time.perf_counter):
+        # 가비지 컬렉션이 일어난 횟수(세대별)와 그동안 멈춘 시간 기록
+        self.clock = clock
+        self.collections = [0, 0, 0]
+        self.pause = 0.0
+        self.longest = 0.0
+        self.started = None
+        self.installed = False
+
+    def install(self):
+        # gc 콜백 등록 (여러 번 불러도 한 번만)
+        if not self.installed:
+            gc.callbacks.append(self.callback)
+            self.installed = True
+
+    def callback(self, phase, info):
+        if phase == 'start':
+            self.started = self.clock()
+        elif self.started is not None:
+            duration = self.clock() - self.started
+            self.collections[info['generation']] += 1
+            self.pause += duration
+            self.longest = max(self.longest, duration)
+            self.started = None
+
+    def stats(self):
+        # 세대별 횟수, 총/최장 멈춤 시간(ms)
+        return {'collections': tuple(self.collections), 'pause_ms': round(self.pause * 1000, 2),
+                'longest_ms': round(self.longest * 1000, 2)}
+
+# 모든 모듈이 함께 쓰는 전역 프로파일러 (기본은 꺼짐)와 GC 감시
+profiler = Profiler()
+gc_monitor = CollectionMonitor()
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+from Entities import PackedStore
+from SpatialHash import grid_pairs
+
+# 방향별 단위 벡터
+DIRECTION_VECTORS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+
+def block_entry(x, y, dx, dy, is_walkable):
+    # (x, y)에서 (x + dx, y + dy)까지 지나는 칸을 DDA로 차례로 밟아 처음 들어간 막힌 칸의 시각(0~1), 없으면 None
+    # 한 틱에 여러 칸을 가도 중간 칸을 건너뛰지 않음 (칸 판정은 기존처럼 좌표를 내림한 칸)
+    cell_x, cell_y = math.floor(x), math.floor(y)
+    if not is_walkable(cell_x, cell_y):
+        return 0.0
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    next_x = ((cell_x + 1 - x) / dx if dx > 0 else (x - cell_x) / -dx) if dx else math.inf
+    next_y = ((cell_y + 1 - y) / dy if dy > 0 else (y - cell_y) / -dy) if dy else math.inf
+    delta_x = 1 / abs(dx) if dx else math.inf
+    delta_y = 1 / abs(dy) if dy else math.inf
+    while True:
+        if next_x < next_y:
+            t = next_x
+            cell_x += step_x
+            next_x += delta_x
+        else:
+            t = next_y
+            cell_y += step_y
+            next_y += delta_y
+        if t > 1:
+            return None
+        if not is_walkable(cell_x, cell_y):
+            return t
+
+def box_entry(x, y, dx, dy, box_x, box_y, half=1.0):
+    # 선분 (x, y) + t(dx, dy)가 중심 (box_x, box_y), 반폭 half인 열린 사각형에 처음 들어가는 시각 t (배열 연산)
+    # 들어가지 않으면 inf (처음부터 겹쳐 있으면 0)
+    enter = np.zeros(np.broadcast(x, box_x).shape)
+    leave = np.ones_like(enter)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start, delta, center in ((x, dx, box_x), (y, dy, box_y)):
+            low, high = center - half - start, center + half - start
+            moving = delta != 0
+            a = np.where(moving, low / np.where(moving, delta, 1), np.where(low < 0, -np.inf, np.inf))
+            b = np.where(moving, high / np.where(moving, delta, 1), np.where(high > 0, np.inf, -np.inf))
+            enter = np.maximum(enter, np.minimum(a, b))
+            leave = np.minimum(leave, np.maximum(a, b))
+    return np.where(enter < leave, enter, np.inf)
+
+class Projectiles(PackedStore):
+    # 발사체 저장소와 한 틱 처리 (틱마다 한 번만 이동, 지나간 경로 전체로 블록/적/본거지 충돌을 한 번에 판정)
+    FIELDS = {
+        'x': (np.float64, ()),
+        'y': (np.float64, ()),
+        'vx': (np.float64, ()),
+        'vy': (np.float64, ()),
+        'speed': (np.float64, ()),
+    }
+
+    def spawn(self, x, y, direction, speed):
+        # 발사체 추가 (재사용하는 뷰 반환, 저장소가 가득 차면 추가하지 않고 None)
+        index = self.allocate()
+        if index is None:
+            return None
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index], self.vy[index] = DIRECTION_VECTORS[direction]
+        self.speed[index] = speed
+        return self.views[index]
+
+    def step(self, dt, game_map, enemies, enemy_slots):
+        # 한 틱 진행: 이동 경로에서 가장 먼저 일어나는 일(적 명중, 본거지 명중, 블록 충돌, 맵 밖)을 처리
+        # enemy_slots: 맞힐 수 있는 (죽는 중이 아닌) 적 슬롯, 반환: (맞힌 적 슬롯 목록, 본거지 명중 여부)
+        count = self.live
+        if count == 0:
+            return [], False
+        x, y = self.x[:count], self.y[:count]
+        dx = self.vx[:count] * self.speed[:count] * dt
+        dy = self.vy[:count] * self.speed[:count] * dt
+
+        # 맵 밖으로 나가는 시각 (기존처럼 좌표가 0 ~ 크기-1을 벗어나면)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exit_x = np.where(dx > 0, (game_map.width - 1 - x) / dx, np.where(dx < 0, -x / dx, np.inf))
+            exit_y = np.where(dy > 0, (game_map.height - 1 - y) / dy, np.where(dy < 0, -y / dy, np.inf))
+        exit_time = np.minimum(exit_x, exit_y)
+        exit_time[exit_time < 0] = 0.0
+
+        # 막힌 칸에 들어가는 시각 (발사체마다 지나는 칸을 차례로)
+        is_walkable = game_map.is_walkable
+        block_time = np.array([math.inf if t is None else t for t in
+                               (block_entry(*args, is_walkable) for args in zip(x.tolist(), y.tolist(), dx.tolist(), dy.tolist()))])
+
+        # 적에 닿는 시각: 격자에서 이동 거리 안의 후보만 골라 지나간 경로 전체로 검사
+        reach = 1 + math.ceil(float(np.max(np.abs(dx) + np.abs(dy))))
+        a, b = grid_pairs(x, y, enemies.x[enemy_slots], enemies.y[enemy_slots], reach)
+        hit_time = box_entry(x[a], y[a], dx[a], dy[a], enemies.x[enemy_slots[b]], enemies.y[enemy_slots[b]])
+        found = hit_time <= 1
+        a, b, hit_time = a[found], enemy_slots[b[found]], hit_time[found]
+        order = np.lexsort((enemies.serial[b], hit_time, a))
+        a, b, hit_time = a[order].tolist(), b[order].tolist(), hit_time[order].tolist()
+
+        # 부술 수 있는 본거지에 닿는 시각
+        hive_time = np.full(count, np.inf)
+        if game_map.hive_state == 2:
+            hive_time = box_entry(x, y, dx, dy, game_map.hive_x, game_map.hive_y)
+
+        # 발사체 순서대로 가장 이른 일 처리 (같은 틱에 먼저 맞은 적은 다음 발사체가 다시 맞히지 않음)
+        kills = []
+        hive_hit = False
+        keep = np.ones(count, dtype=np.bool_)
+        candidates = 0
+        for index in range(count):
+            enemy, enemy_time = None, math.inf
+            while candidates < len(a) and a[candidates] == index:
+                if enemy is None and b[candidates] not in kills:
+                    enemy, enemy_time = b[candidates], hit_time[candidates]
+                candidates += 1
+            hive = hive_time[index] if not hive_hit else math.inf
+            end = min(enemy_time, hive, block_time[index], exit_time[index])
+            if end > 1:
+                continue
+            keep[index] = False
+            if enemy_time == end:
+                kills.append(enemy)
+            elif hive == end:
+                hive_hit = True
+
+        # 남은 발사체 이동 후 사라진 발사체 자리 메우기
+        x += dx
+        y += dy
+        self.compact(keep)
+        return kills, hive_hit
@@ -0,0 +1,255 @@
+import threading
+import time
+from Profiler import profiler
+
+class Renderer:
+    def __init__(self, disp, full_threshold=0.5, max_boxes=48, threaded=False):
+        # 바뀐 영역만 ST7789로 전송하는 렌더러
+        # threaded: 전송은 표시 스레드가 맡고 게임 스레드는 프레임만 넘기고 바로 돌아감
+        #           (대기 칸은 하나뿐이라 표시가 밀리면 오래된 프레임은 버리고 바뀐 영역만 합침)
+        self.disp = disp
+        self.width = disp.width
+        self.height = disp.height
+        self.full_threshold = full_threshold  # 바뀐 면적이 이 비율을 넘으면 전체 전송
+        self.max_boxes = max_boxes
+        self.boxes = []
+        self.sprite_boxes = []
+        self.previous_sprite_boxes = []
+        self.full_redraw = True
+        self.partial_supported = True
+        self.last_bytes = 0
+        self.total_bytes = 0
+        self.frames = 0
+        self.full_pushes = 0
+        self.threaded = threaded
+        self.thread = None
+        self.condition = threading.Condition()
+        self.pending = None  # (이미지, 영역 목록, 넘긴 시각)
+        self.busy = False
+        self.sending = None  # 표시 스레드가 전송 중인 이미지
+        self.buffers = []  # acquire()로 돌려 쓰는 화면 버퍼
+        self.submitted = 0
+        self.dropped = 0
+        self.stages = {}  # 단계 이름: [합계(초), 횟수, 최대(초)]
+
+    def invalidate(self):
+        # 다음 프레임은 화면 전체를 전송
+        self.full_redraw = True
+
+    def mark(self, box):
+        # 이번 프레임에만 바뀐 영역 (x0, y0, x1, y1)
+        self.boxes.append(box)
+
+    def mark_sprite(self, box):
+        # 움직이는 스프라이트 영역 (다음 프레임에 지워져야 하므로 한 번 더 전송)
+        self.sprite_boxes.append(box)
+
+    def dirty_boxes(self):
+        # 이번 프레임에 전송할 영역 계산
+        boxes = []
+        for box in self.boxes + self.sprite_boxes + self.previous_sprite_boxes:
+            box = clip_box(box, self.width, self.height)
+            if box is not None:
+                boxes.append(box)
+        if len(boxes) > self.max_boxes:
+            return None
+        boxes = merge_boxes(boxes)
+        if sum(box_area(box) for box in boxes) > self.full_threshold * self.width * self.height:
+            return None
+        return boxes
+
+    def present(self, image):
+        # 프레임 전송 (바뀐 영역만, 너무 많이 바뀌었으면 전체)
+        # 넘긴 이미지는 전송이 끝날 때까지 수정하지 말 것 (매 프레임 새 이미지를 쓰거나 캐시된 이미지를 그대로 넘김)
+        start = time.perf_counter()
+        boxes = None if self.full_redraw or not self.partial_supported else self.dirty_boxes()
+        self.previous_sprite_boxes = self.sprite_boxes
+        self.sprite_boxes = []
+        self.boxes = []
+        self.full_redraw = False
+        self.record('diff', time.perf_counter() - start)
+        if self.threaded:
+            self.submit(image, boxes)
+        else:
+            self.send(image, boxes)
+
+    def send(self, image, boxes):
+        # 영역 목록대로 디스플레이에 전송 (None이면 전체)
+        start = time.perf_counter()
+        with profiler.section('transfer'):
+            if boxes is None:
+                self.push_full(image)
+            else:
+                self.last_bytes = 0
+                for box in boxes:
+                    if not self.push_region(image, box):
+                        self.push_full(image)
+                        break
+        self.total_bytes += self.last_bytes
+        self.frames += 1
+        self.record('transfer', time.perf_counter() - start)
+
+    def submit(self, image, boxes):
+        # 표시 스레드의 대기 칸에 프레임을 넣음 (아직 안 보낸 프레임이 있으면 버리고 그 영역을 합침)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.display_loop, name='display', daemon=True)
+            self.thread.start()
+        with self.condition:
+            if self.pending is not None:
+                boxes = self.combine(self.pending[1], boxes)
+                self.dropped += 1
+            self.pending = (image, boxes, time.perf_counter())
+            self.submitted += 1
+            self.condition.notify_all()
+
+    def display_loop(self):
+        # 대기 칸의 최신 프레임을 꺼내 전송하는 표시 스레드
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                image, boxes, submitted = self.pending
+                self.pending = None
+                self.busy = True
+                self.sending = image
+            self.record('queue', time.perf_counter() - submitted)
+            try:
+                self.send(image, boxes)
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.sending = None
+                    self.condition.notify_all()
+
+    def flush(self):
+        # 넘긴 프레임이 모두 전송될 때까지 대기 (디스플레이에 직접 그리기 전에 호출)
+        with self.condition:
+            while self.pending is not None or self.busy:
+                self.condition.wait()
+
+    def combine(self, boxes, other):
+        # 버려진 프레임과 새 프레임의 전송 영역 합치기 (둘 중 하나라도 전체면 전체)
+        if boxes is None or other is None:
+            return None
+        boxes = merge_boxes(boxes + other)
+        if len(boxes) > self.max_boxes or sum(box_area(box) for box in boxes) > self.full_threshold * self.width * self.height:
+            return None
+        return boxes
+
+    def record(self, stage, seconds):
+        # 단계별 소요 시간 누적
+        stage = self.stages.setdefault(stage, [0.0, 0, 0.0])
+        stage[0] += seconds
+        stage[1] += 1
+        stage[2] = max(stage[2], seconds)
+
+    def stats(self):
+        # 버린 프레임 수, 프레임당 평균 SPI 전송량, 단계별 평균/최대 시간 (ms)
+        stats = {'submitted': self.submitted, 'dropped': self.dropped, 'sent': self.frames,
+                 'bytes_per_frame': round(self.bytes_per_frame())}
+        for name, (total, count, worst) in list(self.stages.items()):
+            stats[name] = (round(total / count * 1000, 2), round(worst * 1000, 2))
+        return stats
+
+    def acquire(self):
+        # 이번 프레임을 합성할 RGB565 화면 버퍼 (전송 중이거나 대기 중인 버퍼는 피해서 재사용)
+        with self.condition:
+            pending = self.pending[0] if self.pending is not None else None
+            for buffer in self.buffers:
+                if buffer is not pending and buffer is not self.sending:
+                    return buffer
+            from Framebuffer import Framebuffer
+            buffer = Framebuffer(self.width, self.height)
+            self.buffers.append(buffer)
+            return buffer
+
+    def push_raw(self, frame, box):
+        # RGB565 버퍼의 영역을 드라이버의 변환 없이 전송 (패널 회전은 버퍼에서 처리)
+        x0, y0, x1, y1 = box
+        rotation = self.disp.rotation
+        x, y = panel_position(box, rotation, self.width, self.height)
+        width, height = (y1 - y0, x1 - x0) if rotation in (90, 270) else (x1 - x0, y1 - y0)
+        block = getattr(self.disp, '_block', None)
+        if block is None:
+            # RGB565 블록 전송이 없는 드라이버는 PIL 이미지로 변환해 전송
+            self.disp.image(frame.to_image(box), x=x, y=y)
+        else:
+            block(x, y, x + width - 1, y + height - 1, frame.region_bytes(box, rotation))
+        return (x1 - x0) * (y1 - y0) * 2
+
+    def push_full(self, image):
+        # 화면 전체 전송
+        if hasattr(image, 'region_bytes'):
+            self.last_bytes = self.push_raw(image, (0, 0, self.width, self.height))
+            self.full_pushes += 1
+            return
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        self.disp.image(image)
+        self.last_bytes = self.width * self.height * 2
+        self.full_pushes += 1
+
+    def push_region(self, image, box):
+        # 화면 일부 전송 (패널 회전을 고려해 패널 좌표로 변환)
+        x0, y0, x1, y1 = box
+        if hasattr(image, 'region_bytes'):
+            self.last_bytes += self.push_raw(image, box)
+            return True
+        region = image.crop(box)
+        if region.mode != 'RGB':
+            region = region.convert('RGB')
+        x, y = panel_position(box, self.disp.rotation, self.width, self.height)
+        try:
+            self.disp.image(region, x=x, y=y)
+        except (TypeError, ValueError):
+            # 부분 전송을 지원하지 않는 드라이버
+            self.partial_supported = False
+            return False
+        self.last_bytes += (x1 - x0) * (y1 - y0) * 2
+        return True
+
+    def bytes_per_frame(self):
+        # 프레임당 평균 SPI 전송량
+        return self.total_bytes / self.frames if self.frames else 0
+
+def panel_position(box, rotation, width, height):
+    # 화면 좌표 영역의 왼쪽 위 모서리를 회전된 패널 좌표로 변환
+    x0, y0, x1, y1 = box
+    if rotation == 90:
+        return y0, width - x1
+    if rotation == 180:
+        return width - x1, height - y1
+    if rotation == 270:
+        return height - y1, x0
+    return x0, y0
+
+def clip_box(box, width, height):
+    # 화면 밖 영역 잘라내기
+    x0, y0, x1, y1 = box
+    x0, y0 = max(0, int(x0)), max(0, int(y0))
+    x1, y1 = min(width, int(x1)), min(height, int(y1))
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return (x0, y0, x1, y1)
+
+def box_area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+def merge_boxes(boxes, slack=256):
+    # 겹치거나 가까운 영역을 합쳐 전송 횟수를 줄임
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                union = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                if box_area(union) <= box_area(a) + box_area(b) + slack:
+                    boxes[i] = union
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return boxes
\ No newline at end of file
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+from Headless import BUTTONS, HeadlessBackend
+
+# 재현 파일: 매직, 버전, 머리말 길이 + 머리말(JSON) + zlib으로 압축한 틱별 버튼 1바이트
+MAGIC = b'UERP'
+VERSION = 2  # 게임 규칙이 바뀌어 예전 기록이 같은 결과를 내지 않으면 올림
+PREFIX = struct.Struct('<4sBI')
+# 비트 마스크 -> 눌린 버튼 집합 (재생할 때 틱마다 집합을 만들지 않도록 미리 계산)
+BUTTON_SETS = tuple(frozenset(name for i, name in enumerate(BUTTONS) if mask & (1 << i)) for mask in range(1 << len(BUTTONS)))
+
+class GameClock:
+    def __init__(self, start=0.0):
+        # 게임 안의 시각 (초): 벽시계가 아니라 시뮬레이션 틱마다 dt만큼 흐름
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, dt):
+        # 한 틱만큼 진행
+        self.now += dt
+
+    def reset(self):
+        # 새 게임 시작 시 0초로
+        self.now = 0.0
+
+def encode_buttons(pressed):
+    # 눌린 버튼 집합을 1바이트 비트 마스크로
+    mask = 0
+    for i, name in enumerate(BUTTONS):
+        if name in pressed:
+            mask |= 1 << i
+    return mask
+
+def final_state(game):
+    # 재현 결과 비교용 게임 상태 요약 (점수/생명/시간과 맵, 적, 플레이어 위치의 해시)
+    digest = hashlib.sha1()
+    for key in sorted(game.map.modified_chunks):
+        digest.update(struct.pack('<ii', *key))
+        digest.update(game.map.chunks[key])
+    store = game.enemy_store
+    slots = store.slots()
+    order = slots[store.serial[slots].argsort(kind='stable')]
+    for array in (store.x[order], store.y[order], store.dying[order]):
+        digest.update(array.tobytes())
+    digest.update(struct.pack('<dd', game.player.x, game.player.y))
+    return {'score': game.score, 'lives': game.lives, 'blocks_dug': game.blocks_dug, 'elapsed': game.elapsed,
+            'enemies': len(slots), 'hive_state': game.map.hive_state,
+            'game_over': game.game_over, 'game_clear': game.game_clear, 'digest': digest.hexdigest()}
+
+def save_replay(path, header, ticks):
+    # 재현 파일 쓰기 (임시 파일에 쓴 뒤 교체)
+    data = json.dumps(header).encode()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(data)))
+        f.write(data)
+        f.write(zlib.compress(bytes(ticks), 9))
+    os.replace(tmp_path, path)
+
+def load_replay(path):
+    # 재현 파일 읽기: (머리말, 틱별 버튼 마스크 bytes)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    magic, version, length = PREFIX.unpack_from(raw)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path}: not a replay file (version {VERSION})')
+    header = json.loads(raw[PREFIX.size:PREFIX.size + length])
+    return header, zlib.decompress(raw[PREFIX.size + length:])
+
+class ReplayRecorder:
+    def __init__(self, path):
+        # 게임 한 판의 시드와 틱별 버튼 상태를 모아 끝날 때 파일로 저장 (판마다 덮어씀)
+        self.path = path
+        self.header = None
+        self.ticks = bytearray()
+
+    def begin(self, game):
+        # 게임 시작: 같은 판을 다시 만드는 데 필요한 설정 기록
+        self.header = {'difficulty': game.difficulty, 'seed': game.seed, 'settings': game.settings,
+                       'update_hz': game.update_hz, 'world_size': [game.map.width, game.map.height]}
+        self.ticks = bytearray()
+
+    def record(self, pressed):
+        # 한 틱에 처리한 버튼
+        self.ticks.append(encode_buttons(pressed))
+
+    def finish(self, game):
+        # 게임 종료(또는 중단): 최종 상태와 함께 저장 (이미 저장했으면 무시)
+        if self.header is None:
+            return
+        self.header['ticks'] = len(self.ticks)
+        self.header['result'] = final_state(game)
+        save_replay(self.path, self.header, self.ticks)
+        self.header = None
+
+def headless_game(update_hz=20, world_size=(15, 14)):
+    # 화면은 메모리에 두고 버튼은 호출하는 쪽이 넘겨 주는 시뮬레이션용 게임 (경로 재계산 시간 예산 없음)
+    from Game import Game
+    from Joystick import Joystick
+    joystick = Joystick(HeadlessBackend([(float('inf'), '')]))
+    joystick.input.stop()  # 버튼은 입력 장치에서 읽지 않으므로 샘플링 스레드가 필요 없음
+    return Game(joystick, update_hz=update_hz, world_size=world_size, replan_budget_us=None)
+
+def play(path, render=False):
+    # 기록을 헤드리스로 벽시계와 상관없이 최대한 빨리 다시 실행해 (머리말, 최종 상태, 걸린 시간) 반환
+    # render: 매 틱 화면도 합성/전송 (렌더링 성능 회귀 확인용)
+    header, ticks = load_replay(path)
+    game = headless_game(header['update_hz'], tuple(header['world_size']))
+    game.start(header['difficulty'], header['seed'], header['settings'])
+    step = 1.0 / game.update_hz
+    start = time.perf_counter()
+    for mask in ticks:
+        game.handle_input(step, BUTTON_SETS[mask])
+        game.update(step)
+        if render:
+            game.draw()
+        if game.game_over or game.game_clear:
+            break
+    game.renderer.flush()
+    return header, final_state(game), time.perf_counter() - start
+
+if __name__ == '__main__':
+    # 사용법: python Replay.py run.replay [--render] (main.py --record로 남긴 판을 다시 실행해 결과 비교)
+    import sys
+    header, result, elapsed = play(sys.argv[1], '--render' in sys.argv[2:])
+    ticks = header['ticks']
+    print(f"{header['difficulty']} seed {header['seed']}: {ticks} ticks ({ticks / header['update_hz']:.1f}s of play) "
+          f"in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/s)")
+    print(f"score {result['score']}, lives {result['lives']}, blocks {result['blocks_dug']}, digest {result['digest'][:12]}")
+    if result != header['result']:
+        for key, value in header['result'].items():
+            if result.get(key) != value:
+                print(f'mismatch {key}: recorded {value}, replayed {result.get(key)}')
+        sys.exit(1)
+    print('final state matches the recording')
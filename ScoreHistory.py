@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+history_path = os.path.join(current_dir, 'scores.db')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    blocks_dug INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (difficulty, score DESC);
+'''
+
+class ScoreHistory:
+    def __init__(self, path=history_path):
+        # 모든 판의 기록을 보관하는 SQLite 저장소 (난이도+점수 인덱스로 순위/최고점/백분위 조회)
+        # 연결은 스레드마다 따로 열고, WAL 모드라 쓰기 스레드가 기록하는 동안에도 읽을 수 있음
+        self.path = path
+        self.local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        # 현재 스레드 전용 연결
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            self.local.connection = connection
+        return connection
+
+    def add_runs(self, runs):
+        # 여러 판의 기록을 한 트랜잭션으로 추가 (run: difficulty, score, duration, blocks_dug, time 키를 가진 dict)
+        with self.connection() as connection:
+            connection.executemany(
+                'INSERT INTO runs (difficulty, score, duration, blocks_dug, played_at) VALUES (?, ?, ?, ?, ?)',
+                [(run['difficulty'], run['score'], run.get('duration', 0.0), run.get('blocks_dug', 0),
+                  run.get('time', time.time())) for run in runs])
+
+    def add_run(self, difficulty, score, duration=0.0, blocks_dug=0):
+        # 한 판의 기록 추가
+        self.add_runs([{'difficulty': difficulty, 'score': score, 'duration': duration, 'blocks_dug': blocks_dug}])
+
+    def top(self, difficulty, count=5, page=0):
+        # 난이도별 점수 순위 한 페이지 [(score, duration, blocks_dug, played_at), ...]
+        return self.connection().execute(
+            'SELECT score, duration, blocks_dug, played_at FROM runs WHERE difficulty = ? '
+            'ORDER BY score DESC LIMIT ? OFFSET ?', (difficulty, count, page * count)).fetchall()
+
+    def best(self, difficulty):
+        # 난이도별 최고 점수 (기록이 없으면 None)
+        return self.connection().execute(
+            'SELECT MAX(score) FROM runs WHERE difficulty = ?', (difficulty,)).fetchone()[0]
+
+    def count(self, difficulty):
+        # 난이도별 기록 수
+        return self.connection().execute(
+            'SELECT COUNT(*) FROM runs WHERE difficulty = ?', (difficulty,)).fetchone()[0]
+
+    def percentile(self, score, difficulty):
+        # 해당 점수보다 낮은 기록의 비율 (0~100, 기록이 없으면 None)
+        below, total = self.connection().execute(
+            'SELECT (SELECT COUNT(*) FROM runs WHERE difficulty = ? AND score < ?), '
+            '(SELECT COUNT(*) FROM runs WHERE difficulty = ?)', (difficulty, score, difficulty)).fetchone()
+        if not total:
+            return None
+        return 100.0 * below / total
+
+    def close(self):
+        # 현재 스레드의 연결 닫기
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+def benchmark(runs=100000, queries=200):
+    # 임시 DB에 기록을 채우고 조회별 평균 시간(ms) 출력
+    import random
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        history = ScoreHistory(os.path.join(directory, 'bench.db'))
+        difficulties = ['easy', 'medium', 'hard']
+        start = time.perf_counter()
+        history.add_runs([{'difficulty': random.choice(difficulties), 'score': random.randrange(0, 50000),
+                           'duration': random.uniform(10, 600), 'blocks_dug': random.randrange(0, 200)}
+                          for _ in range(runs)])
+        print(f'insert {runs} runs: {(time.perf_counter() - start) * 1000:.1f} ms')
+        cases = [
+            ('top 5', lambda: history.top(random.choice(difficulties))),
+            ('top 5, page 10', lambda: history.top(random.choice(difficulties), page=10)),
+            ('best', lambda: history.best(random.choice(difficulties))),
+            ('percentile', lambda: history.percentile(random.randrange(0, 50000), random.choice(difficulties))),
+            ('single insert', lambda: history.add_run('easy', random.randrange(0, 50000), 60.0, 10)),
+        ]
+        for name, query in cases:
+            start = time.perf_counter()
+            for _ in range(queries):
+                query()
+            print(f'{name}: {(time.perf_counter() - start) * 1000 / queries:.3f} ms')
+        history.close()
+
+if __name__ == '__main__':
+    # 사용법: python ScoreHistory.py [기록 수]
+    import sys
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
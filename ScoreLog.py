@@ -0,0 +1,166 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+log_path = os.path.join(current_dir, 'scores.log')
+legacy_path = os.path.join(current_dir, 'scores.json')
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+def insert_top(table, score, keep):
+    # 내림차순 상위 목록에 점수 끼워 넣기 (keep개 유지)
+    if len(table) >= keep and score <= table[-1]:
+        return False
+    index = len(table)
+    while index > 0 and table[index - 1] < score:
+        index -= 1
+    table.insert(index, score)
+    del table[keep:]
+    return True
+
+class ScoreLog:
+    def __init__(self, path=log_path, legacy=legacy_path, keep=5, compact_every=64, history=None):
+        # 점수를 추가 전용 로그(JSON 한 줄에 기록 하나)로 저장
+        # 파일 쓰기는 백그라운드 스레드가 맡으므로 게임 스레드는 기다리지 않음
+        # history(ScoreHistory)가 있으면 같은 스레드에서 모든 기록을 전체 이력 DB에도 추가
+        self.path = path
+        self.legacy = legacy
+        self.keep = keep
+        self.compact_every = compact_every
+        self.history = history
+        self.written = {difficulty: [] for difficulty in DIFFICULTIES}  # 로그에 반영된 상위 점수 (시작 후에는 쓰기 스레드 전용)
+        self.unsaved = []  # 추가했지만 쓰기 스레드가 아직 처리하지 않은 기록 (이력 DB에 아직 없음)
+        self.records = 0
+        self.compactions = 0
+        self.errors = 0
+        self.queue = queue.Queue()
+        self.load()
+        if history is not None and not any(history.count(difficulty) for difficulty in DIFFICULTIES):
+            # 이력 DB를 처음 만들 때 기존 상위 점수를 옮겨 둠
+            history.add_runs([{'difficulty': difficulty, 'score': score, 'time': 0.0}
+                              for difficulty, table in self.written.items() for score in table])
+        self.thread = threading.Thread(target=self.writer, name='score-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def load(self):
+        # 로그를 한 번 훑어 난이도별 상위 점수 복원 (전원 차단으로 잘린 마지막 줄은 무시)
+        if not os.path.exists(self.path):
+            self.import_legacy()
+            return
+        torn = False
+        with open(self.path, 'r') as f:
+            for line in f:
+                torn = not line.endswith('\n')
+                try:
+                    record = json.loads(line)
+                    difficulty, score = record['difficulty'], int(record['score'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if difficulty in self.written:
+                    insert_top(self.written[difficulty], score, self.keep)
+                    self.records += 1
+        if torn:
+            # 잘린 줄 뒤에 새 기록이 이어 붙지 않도록 먼저 정리
+            self.compact()
+
+    def import_legacy(self):
+        # 예전 scores.json (실행 위치 또는 모듈 옆)이 있으면 로그로 옮김
+        for path in (self.legacy, os.path.abspath('scores.json')):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    legacy = json.load(f)
+            except ValueError:
+                continue
+            for difficulty, table in legacy.items():
+                if difficulty in self.written:
+                    for score in table:
+                        insert_top(self.written[difficulty], int(score), self.keep)
+            self.compact()
+            return
+
+    def add(self, score, difficulty, duration=0.0, blocks_dug=0):
+        # 점수 추가 (파일/DB 기록은 쓰기 스레드에 넘김)
+        record = {'difficulty': difficulty, 'score': score, 'duration': round(duration, 3),
+                  'blocks_dug': blocks_dug, 'time': round(time.time(), 3)}
+        self.unsaved.append(record)
+        self.queue.put(record)
+
+    def saving(self):
+        # 쓰기 스레드가 아직 처리하지 않은 기록이 있는지 (DB 반영이 끝난 기록은 쓰기 스레드가 목록에서 뺌)
+        return bool(self.unsaved)
+
+    def writer(self):
+        # 대기열에 쌓인 기록을 한꺼번에 로그 끝에 덧붙임 (None을 받으면 남은 기록을 쓰고 종료)
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            running = len(records) == len(batch)
+            try:
+                if records:
+                    self.append(records)
+            except (OSError, sqlite3.Error):
+                # 저장 장치 오류: 게임은 계속하고 이 기록들만 버림
+                self.errors += 1
+            finally:
+                for record in records:
+                    self.unsaved.remove(record)
+                for _ in batch:
+                    self.queue.task_done()
+
+    def append(self, batch):
+        # 기록 여러 개를 한 번의 쓰기와 fsync로 로그에 추가
+        with open(self.path, 'a') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in batch))
+            f.flush()
+            os.fsync(f.fileno())
+        for record in batch:
+            insert_top(self.written[record['difficulty']], record['score'], self.keep)
+        if self.history is not None:
+            self.history.add_runs(batch)
+        self.records += len(batch)
+        if self.records >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        # 상위 점수만 남긴 새 로그를 임시 파일에 쓰고 rename으로 교체 (중간에 꺼져도 둘 중 하나는 온전함)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            for difficulty, table in self.written.items():
+                for score in table:
+                    f.write(json.dumps({'difficulty': difficulty, 'score': score}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        if hasattr(os, 'O_DIRECTORY'):
+            # 이름 바꾸기 자체도 디스크에 남도록 디렉터리 동기화
+            directory = os.open(os.path.dirname(self.path) or '.', os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self.records = sum(len(table) for table in self.written.values())
+        self.compactions += 1
+
+    def flush(self):
+        # 대기 중인 기록이 모두 파일에 쓰일 때까지 대기
+        self.queue.join()
+
+    def close(self):
+        # 남은 기록을 쓰고 쓰기 스레드 종료
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
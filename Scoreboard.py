@@ -1,68 +1,74 @@
-from PIL import Image, ImageDraw, ImageFont
-import time
-import json
-import os
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-asset_path = os.path.join(current_dir, 'assets')
+from Glyphs import glyph_font, FONT_REGULAR, FONT_BOLD
+from Assets import assets
+from ScoreHistory import ScoreHistory
+from ScoreLog import ScoreLog
+from Profiler import profiler
 
 class Scoreboard:
     def __init__(self, joystick):
         self.joystick = joystick
-        self.font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-        self.small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-        self.scores = {'easy': [], 'medium': [], 'hard': []}
-        self.background = Image.open(os.path.join(asset_path, 'score.png')).resize((240, 240))
-        self.load_scores()
-
-    def load_scores(self):
-        # 저장된 점수 불러오기
-        if os.path.exists('scores.json'):
-            with open('scores.json', 'r') as f:
-                self.scores = json.load(f)
+        self.font = glyph_font(FONT_BOLD, 18)
+        self.small_font = glyph_font(FONT_REGULAR, 16)
+        self.background = assets.get('score.png', (240, 240))
+        self.history = ScoreHistory()
+        self.log = ScoreLog(history=self.history)
 
-    def save_scores(self):
-        # 점수 저장
-        with open('scores.json', 'w') as f:
-            json.dump(self.scores, f)
+    def add_score(self, score, difficulty, duration=0.0, blocks_dug=0):
+        # 새 점수 추가 (파일/DB 기록은 백그라운드에서 처리되므로 바로 반환)
+        self.log.add(score, difficulty, duration, blocks_dug)
 
-    def add_score(self, score, difficulty):
-        # 새 점수 추가
-        self.scores[difficulty].append(score)
-        self.scores[difficulty].sort(reverse=True)
-        self.scores[difficulty] = self.scores[difficulty][:5]
-        self.save_scores()
+    def render(self, difficulty, score, played):
+        # 난이도별 순위 화면 (인덱스 조회 결과로 한 번만 그림)
+        page = self.history.top(difficulty, 5)
+        percentile = self.history.percentile(score, difficulty) if difficulty == played else None
+        image = self.background.copy()
 
-    def display(self, score, difficulty):
-        # 스코어보드 표시 및 사용자 입력 처리
-        self.add_score(score, difficulty)
-        while True:
-            image = self.background.copy()
-            draw = ImageDraw.Draw(image)
+        # 타이틀 그리기
+        title = f"{difficulty.upper()} SCORES"
+        self.font.draw_centered(image, 10, title, (0, 0, 255))
 
-            # 타이틀 그리기
-            title = f"{difficulty.upper()} SCORES"
-            title_width, _ = draw.textsize(title, font=self.font)
-            draw.text(((240 - title_width) // 2, 10), title, font=self.font, fill=(0, 0, 255))
+        # 점수 그리기
+        for i, entry in enumerate(page):
+            self.small_font.draw(image, (10, 40 + i * 30), f"{i+1}. {entry[0]}", (0, 0, 255))
 
-            # 점수 그리기
-            for i, score in enumerate(self.scores[difficulty][:5]):
-                draw.text((10, 40 + i * 30), f"{i+1}. {score}", font=self.small_font, fill=(0, 0, 255))
+        # 이번 판 점수와 전체 기록 중 위치
+        if percentile is not None:
+            self.small_font.draw(image, (10, 175), f"You: {score} (top {100 - percentile:.0f}%)", (0, 0, 255))
 
-            # 안내 메시지 그리기
-            draw.text((10, 200), "Press 5: Menu", font=self.small_font, fill=(0, 0, 255))
-            draw.text((10, 220), "Press 6: Other Difficulties", font=self.small_font, fill=(0, 0, 255))
+        # 안내 메시지 그리기
+        self.small_font.draw(image, (10, 200), "Press 5: Menu", (0, 0, 255))
+        self.small_font.draw(image, (10, 220), "Press 6: Other Difficulties", (0, 0, 255))
+        return image
 
-            self.joystick.disp.image(image)
+    def display(self, score, difficulty, duration=0.0, blocks_dug=0):
+        # 스코어보드 표시 및 사용자 입력 처리 (난이도가 바뀔 때만 화면 전송, 그 외에는 입력을 기다림)
+        self.add_score(score, difficulty, duration, blocks_dug)
+        played = difficulty
+        pages = {}
+        self.joystick.input.clear()
+        shown = None
+        saving = True
+        while True:
+            if saving and not self.log.saving():
+                # 방금 끝난 판이 DB에 들어가면 그 전에 그린 화면을 다시 그림 (쓰기 스레드를 기다리지 않음)
+                saving = False
+                pages.clear()
+                shown = None
+            if difficulty != shown:
+                if difficulty not in pages:
+                    with profiler.section('scoreboard.render'):
+                        pages[difficulty] = self.render(difficulty, score, played)
+                with profiler.section('scoreboard.present'):
+                    self.joystick.disp.image(pages[difficulty])
+                shown = difficulty
 
             # 사용자 입력 처리
-            if not self.joystick.button_A.value:
-                time.sleep(0.2)
+            event = self.joystick.input.get(0.1 if saving else None)
+            if event is None or event.kind != 'press':
+                continue
+            if event.button == 'A':
                 return True
-            elif not self.joystick.button_B.value:
-                time.sleep(0.2)
+            elif event.button == 'B':
                 difficulties = ['easy', 'medium', 'hard']
                 current_index = difficulties.index(difficulty)
                 difficulty = difficulties[(current_index + 1) % 3]
-
-            time.sleep(0.1)
\ No newline at end of file
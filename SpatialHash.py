@@ -0,0 +1,32 @@
+import numpy as np
+
+def grid_pairs(ax, ay, bx, by, radius=1):
+    # 맵 칸(16px) 단위 균일 격자에서 A 각 원소의 주변 칸(반경 radius 칸)에 있는 B 후보 쌍
+    # B를 칸 번호로 정렬해 두고 행마다 이진 탐색으로 구간을 찾으므로 비용은 주변 객체 수에 비례
+    empty = np.zeros(0, dtype=np.int64)
+    if len(ax) == 0 or len(bx) == 0:
+        return empty, empty
+    acx, acy = np.floor(ax).astype(np.int64), np.floor(ay).astype(np.int64)
+    bcx, bcy = np.floor(bx).astype(np.int64), np.floor(by).astype(np.int64)
+    min_x = min(acx.min(), bcx.min()) - radius
+    stride = max(acx.max(), bcx.max()) - min_x + radius + 1
+    keys = bcy * stride + (bcx - min_x)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    pairs_a, pairs_b = [], []
+    for offset_y in range(-radius, radius + 1):
+        # 같은 행의 x 범위는 정렬된 칸 번호에서 연속 구간
+        row = (acy + offset_y) * stride
+        lo = np.searchsorted(sorted_keys, row + (acx - radius - min_x), 'left')
+        hi = np.searchsorted(sorted_keys, row + (acx + radius - min_x), 'right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        starts = np.cumsum(counts) - counts
+        pairs_a.append(np.repeat(np.arange(len(ax)), counts))
+        pairs_b.append(order[np.repeat(lo - starts, counts) + np.arange(total)])
+    if not pairs_a:
+        return empty, empty
+    return np.concatenate(pairs_a), np.concatenate(pairs_b)
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+class StartupTimer:
+    def __init__(self, start=None, clock=time.perf_counter):
+        # 시작 단계별 소요 시간 기록 (메인 스레드와 예열 스레드 모두)
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.phases = []
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def measure(self, name, factory, *args):
+        # factory(*args)를 실행하고 걸린 시간을 기록한 뒤 결과 반환
+        begin = self.clock()
+        result = factory(*args)
+        self.record(name, begin, self.clock())
+        return result
+
+    def record(self, name, begin, end):
+        # 이미 측정한 단계 기록
+        with self.lock:
+            self.phases.append((name, threading.current_thread().name, begin - self.start, end - begin))
+
+    def background(self, name, factory, *args):
+        # 예열 스레드에서 순서대로 실행 (결과는 Future.result()로 받음, 아직이면 끝날 때까지 대기)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='warmup')
+        return self.executor.submit(self.measure, name, factory, *args)
+
+    def report(self):
+        # 단계별 시작 시각과 소요 시간 표
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[2])
+        lines = ['startup:']
+        for name, thread, begin, duration in phases:
+            lines.append(f'  {name:<12} +{begin * 1000:7.1f} ms  {duration * 1000:7.1f} ms  ({thread})')
+        return '\n'.join(lines)
@@ -0,0 +1,6 @@
+from Assets import bake, atlas_path
+
+# assets/ 의 스프라이트를 미리 가공해 아틀라스로 저장
+# 사용법: python bake.py
+count, size = bake()
+print(f'{count} sprites baked into {atlas_path} ({size} bytes)')
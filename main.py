@@ -1,42 +1,102 @@
 import time
-from Game import Game
+boot = time.perf_counter()
+import sys
 from Menu import Menu
-from Scoreboard import Scoreboard
 from Joystick import Joystick
+from Headless import HeadlessBackend, ScriptFinished, load_script
+from Assets import assets
+from Startup import StartupTimer
+from Profiler import profiler
 
 
+def load_game(joystick):
+    # 게임 모듈(numpy 포함) 가져오기와 생성을 예열 스레드에서 처리
+    from Game import Game
+    game = Game(joystick)
+    game.trace = trace_path is not None
+    if record_path is not None:
+        from Replay import ReplayRecorder
+        game.recorder = ReplayRecorder(record_path)
+        game.planner.budget_us = None  # 경로 재계산량이 기계 속도에 좌우되면 재현되지 않음
+    return game
 
-joystick = Joystick()
-menu = Menu(joystick)
-game = Game(joystick)
-scoreboard = Scoreboard(joystick)
+def load_scoreboard(joystick):
+    # 스코어보드 모듈(sqlite 포함) 가져오기와 생성
+    from Scoreboard import Scoreboard
+    return Scoreboard(joystick)
+
+def take_option(args, name):
+    # args에서 "name 값" 한 쌍을 꺼내 값을 반환 (없으면 None)
+    if name not in args[:-1]:
+        return None
+    index = args.index(name)
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+# 사용법: python main.py                      (라즈베리 파이)
+#         python main.py --headless script.json (입력 스크립트로 헤드리스 실행)
+#         python main.py --trace trace.json      (단계별 시간을 계속 기록해 종료 시 저장, .csv도 가능)
+#         python main.py --record run.replay     (마지막 판의 시드와 틱별 입력을 저장, python Replay.py run.replay로 재현)
+timer = StartupTimer(boot)
+timer.record('imports', boot, time.perf_counter())
+args = sys.argv[1:]
+trace_path = take_option(args, '--trace')
+record_path = take_option(args, '--record')
+if trace_path is not None:
+    profiler.enabled = True
+if len(args) > 1 and args[0] == '--headless':
+    joystick = timer.measure('joystick', Joystick, HeadlessBackend(load_script(args[1])))
+else:
+    joystick = timer.measure('joystick', Joystick)
+
+# 메뉴를 먼저 띄우고 게임/스코어보드/나머지 스프라이트는 난이도를 고르는 동안 예열 스레드에서 준비
+menu = timer.measure('menu', Menu, joystick)
+timer.measure('first frame', menu.show)
+pending_game = timer.background('game', load_game, joystick)
+pending_scoreboard = timer.background('scoreboard', load_scoreboard, joystick)
+timer.background('sprites', assets.preload).add_done_callback(lambda _: print(timer.report()))
+game = None
 
 # 현재 화면 상태를 'menu'로 설정
 current_screen = 'menu'
 
-while True:
-    if current_screen == 'menu':
-        difficulty = menu.display()
-        if difficulty == 'exit':
-            # 종료 선택 시 루프 종료
-            break
-        elif difficulty in ['easy', 'medium', 'hard']:
-            # 난이도 선택 시 게임 화면으로 전환
-            current_screen = 'game'
-            game.start(difficulty)
+start_wall = time.perf_counter()
+start_cpu = time.process_time()
+try:
+    while True:
+        if current_screen == 'menu':
+            difficulty = menu.display()
+            if difficulty == 'exit':
+                # 종료 선택 시 루프 종료
+                break
+            elif difficulty in ['easy', 'medium', 'hard']:
+                # 난이도 선택 시 게임 화면으로 전환
+                current_screen = 'game'
+                game = pending_game.result()
+                game.start(difficulty)
             
-    elif current_screen == 'game':
-        result = game.run()
-        if result == 'game_over' or result == 'game_clear':
-            # 게임 종료 시 스코어보드 화면으로 전환
-            current_screen = 'scoreboard'
-    elif current_screen == 'scoreboard':
-        if scoreboard.display(game.score, game.difficulty):
-            # 메뉴로 돌아가기 선택 시 메뉴 화면으로 전환
-            current_screen = 'menu'
-
-    time.sleep(0.1)
+        elif current_screen == 'game':
+            result = game.run()
+            if result == 'game_over' or result == 'game_clear':
+                # 게임 종료 시 스코어보드 화면으로 전환
+                current_screen = 'scoreboard'
+        elif current_screen == 'scoreboard':
+            if pending_scoreboard.result().display(game.score, game.difficulty, game.elapsed, game.blocks_dug):
+                # 메뉴로 돌아가기 선택 시 메뉴 화면으로 전환
+                current_screen = 'menu'
+except ScriptFinished:
+    # 헤드리스 실행 결과 보고 (CPU 시간은 sleep을 제외한 순수 시뮬레이션/렌더 비용)
+    disp = joystick.disp
+    print(f'wall {time.perf_counter() - start_wall:.2f}s, cpu {time.process_time() - start_cpu:.2f}s, '
+          f'{disp.pushes} pushes, {disp.bytes} bytes, {game.loop_stats() if game else {}}')
+finally:
+    # 측정 기록과 진행 중이던 판의 입력 기록 저장 (Ctrl+C로 끝내도 저장)
+    if game is not None and game.recorder is not None:
+        game.recorder.finish(game)
+    if trace_path is not None:
+        print(f'trace: {profiler.dump(trace_path)} records -> {trace_path}')
 
 # 게임 종료 시 화면 초기화
 joystick.disp.fill(0)
-joystick.disp.show()
\ No newline at end of file
+joystick.disp.show()